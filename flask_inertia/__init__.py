@@ -31,13 +31,9 @@ Flask-Inertia
 Inertiajs Adapter for Flask.
 """
 
+import importlib
+
 from flask_inertia.inertia import Inertia
-from flask_inertia.views import (
-    always_include,
-    inertia_location,
-    lazy_include,
-    render_inertia,
-)
 
 __all__ = [
     "Inertia",
@@ -45,5 +41,21 @@ __all__ = [
     "inertia_location",
     "lazy_include",
     "always_include",
+    "depends_include",
+    "coalesced_include",
+    "defer_include",
+    "table_include",
+    "raw_json_include",
+    "deadline_include",
 ]
 __version__ = "0.9"
+
+
+def __getattr__(name: str):
+    # views helpers are imported on first access to keep the package import light
+    if name in __all__:
+        value = getattr(importlib.import_module("flask_inertia.views"), name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.batch
+-------------------
+
+Serve several Inertia partial reloads in a single request.
+"""
+
+import json
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from flask import Response, abort, current_app, g, request, session
+from flask.ctx import RequestContext
+from werkzeug.datastructures import Headers
+from werkzeug.test import EnvironBuilder
+
+
+def _get_descriptors() -> List[Dict[str, Any]]:
+    descriptors = request.get_json(silent=True)
+    if not isinstance(descriptors, list) or not all(
+        isinstance(descriptor, dict)
+        and isinstance(descriptor.get("url"), str)
+        and isinstance(descriptor.get("component"), str)
+        and isinstance(descriptor.get("only"), list)
+        and descriptor["only"]
+        and all(isinstance(key, str) for key in descriptor["only"])
+        for descriptor in descriptors
+    ):
+        abort(400, "Batch reloads must be a list of url, component and only props.")
+
+    max_size = current_app.config.get("INERTIA_BATCH_MAX_SIZE", 10)
+    if len(descriptors) > max_size:
+        abort(400, f"Batch reloads are limited to {max_size} requests.")
+
+    return descriptors
+
+
+def _dispatch(descriptor: Dict[str, Any], headers: Headers) -> Response:
+    app = current_app._get_current_object()
+    url = urlsplit(descriptor["url"])
+    headers = Headers(headers)
+    headers["X-Inertia-Partial-Component"] = descriptor["component"]
+    headers["X-Inertia-Partial-Data"] = ",".join(descriptor["only"])
+    environ = EnvironBuilder(
+        path=url.path,
+        query_string=url.query,
+        base_url=request.root_url,
+        headers=headers,
+        environ_base={"REMOTE_ADDR": request.remote_addr},
+    ).get_environ()
+
+    # the application context, and thus ``g``, is shared with the batch request
+    # but resources depend on the reloaded URL and are cached per reload
+    resources = g.pop("_inertia_resources", None)
+    try:
+        with RequestContext(app, environ, session=session._get_current_object()):
+            return app.full_dispatch_request()
+    finally:
+        g.pop("_inertia_resources", None)
+        if resources is not None:
+            g._inertia_resources = resources
+
+
+def batch_reload() -> Response:
+    """Dispatch the partial reloads sent as a JSON list and combine their responses.
+
+    Each reload is described by the ``url`` of the page, its ``component`` and the
+    ``only`` props to reload, and dispatched as a GET request with the batch
+    request headers through the application hooks and views. The reloads share
+    the batch request session and ``g``, while the resources are evaluated for
+    each reload as they depend on its URL.
+
+    Returns a JSON list with for each reload its ``status`` and either its
+    ``page`` object or the ``location`` of the page to visit (i.e. when the asset
+    version changed). At most ``INERTIA_BATCH_MAX_SIZE`` reloads (10 by default)
+    are accepted.
+    """
+    descriptors = _get_descriptors()
+    headers = Headers(request.headers)
+    for name in ("Content-Type", "Content-Length", "Accept"):
+        headers.remove(name)
+    headers["Accept"] = "application/json"
+    headers["X-Inertia"] = "true"
+    headers["X-Requested-With"] = "XMLHttpRequest"
+
+    # pages are spliced in the combined payload as they were encoded
+    parts = []
+    for descriptor in descriptors:
+        response = _dispatch(descriptor, headers)
+        if response.headers.get("X-Inertia") and response.is_json:
+            page = response.get_data(as_text=True).strip()
+            parts.append(f'{{"status": {response.status_code}, "page": {page}}}')
+            continue
+
+        part = {"status": response.status_code}
+        location = response.headers.get(
+            "X-Inertia-Location"
+        ) or response.headers.get("Location")
+        if location:
+            part["location"] = location
+        parts.append(json.dumps(part))
+
+    return current_app.response_class(
+        f"[{', '.join(parts)}]", mimetype="application/json"
+    )
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.bench
+-------------------
+
+Replay Inertia requests against the WSGI application in-process to measure its
+throughput, its latency and its payload sizes per component, with no network or
+external load generator.
+
+Scenarios are JSON lists of requests:
+
+.. code-block:: json
+
+   [
+     {"path": "/users/"},
+     {"path": "/users/", "kind": "navigate", "weight": 3},
+     {"path": "/users/", "kind": "partial", "component": "Users", "only": ["stats"]}
+   ]
+
+* ``kind``: ``"visit"`` (full HTML visit, the default), ``"navigate"`` (Inertia
+  XHR navigation) or ``"partial"`` (partial reload of the ``only`` props of the
+  ``component``)
+* ``weight``: how many times the request is replayed per round (1 by default)
+"""
+
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from flask import Flask
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from flask_inertia.encoding import PAGE_ENVIRON_KEY
+from flask_inertia.version import get_asset_version
+
+KINDS = ("visit", "navigate", "partial")
+
+
+class BenchRequest(NamedTuple):
+    """Request replayed by the benchmark."""
+
+    path: str
+    kind: str = "visit"
+    component: Optional[str] = None
+    only: Tuple[str, ...] = ()
+    weight: int = 1
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchRequest":
+        """Load a scenario request, raising ``ValueError`` if it is invalid.
+
+        :param data: The request declared in the scenario
+        """
+        request = cls(
+            path=data["path"],
+            kind=data.get("kind", "visit"),
+            component=data.get("component"),
+            only=tuple(data.get("only", ())),
+            weight=int(data.get("weight", 1)),
+        )
+        if request.kind not in KINDS:
+            raise ValueError(f"Bench request ``kind`` must be one of {KINDS}.")
+        if request.kind == "partial" and not (request.component and request.only):
+            raise ValueError(
+                "Partial bench requests need a ``component`` and props."
+            )
+        return request
+
+
+class ComponentStats(NamedTuple):
+    """Measures of the requests rendering a component."""
+
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p95: float
+    p99: float
+    size: float
+
+
+class BenchReport(NamedTuple):
+    """Result of a benchmark run."""
+
+    requests: int
+    duration: float
+    workers: int
+    components: Dict[str, ComponentStats]
+
+    @property
+    def throughput(self) -> float:
+        """Requests per second of all the workers."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        """Describe the report as a table, latencies in milliseconds."""
+        lines = [
+            f"{self.requests} requests in {self.duration:.2f}s with {self.workers} "
+            f"workers ({self.throughput:.1f} req/s)",
+            "",
+            f"{'component':<30} {'requests':>8} {'errors':>6} {'req/s':>9} "
+            f"{'p50':>8} {'p95':>8} {'p99':>8} {'bytes':>9}",
+        ]
+        for component, stats in sorted(self.components.items()):
+            lines.append(
+                f"{component:<30} {stats.requests:>8} {stats.errors:>6} "
+                f"{stats.throughput:>9.1f} {stats.p50 * 1000:>8.2f} "
+                f"{stats.p95 * 1000:>8.2f} {stats.p99 * 1000:>8.2f} "
+                f"{stats.size:>9.0f}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as JSON serializable data."""
+        return {
+            "requests": self.requests,
+            "duration": self.duration,
+            "workers": self.workers,
+            "throughput": self.throughput,
+            "components": {
+                component: stats._asdict()
+                for component, stats in self.components.items()
+            },
+        }
+
+
+def load_scenario(path: str) -> List[BenchRequest]:
+    """Load the requests of a JSON scenario file.
+
+    :param path: The scenario file path
+    """
+    with open(path) as scenario:
+        return [BenchRequest.from_dict(data) for data in json.load(scenario)]
+
+
+# measures of a worker: its duration and for each component the latencies, the
+# payload sizes and the count of error responses
+_Measures = Tuple[float, Dict[str, Dict[str, Any]]]
+
+
+def run_requests(app: Flask, requests: List[BenchRequest], count: int) -> _Measures:
+    """Replay requests in turn against the application WSGI callable.
+
+    Each request is sent once to warm the application up before being measured.
+
+    :param app: The Flask application
+    :param requests: The requests to replay
+    :param count: The number of measured requests
+    """
+    with app.app_context():
+        version = get_asset_version()
+
+    environs = []
+    for request in requests:
+        headers = {}
+        if request.kind != "visit":
+            headers["X-Inertia"] = "true"
+            headers["X-Inertia-Version"] = version
+            headers["X-Requested-With"] = "XMLHttpRequest"
+        if request.kind == "partial":
+            headers["X-Inertia-Partial-Component"] = request.component
+            headers["X-Inertia-Partial-Data"] = ",".join(request.only)
+        environ = EnvironBuilder(path=request.path, headers=headers).get_environ()
+        environ[PAGE_ENVIRON_KEY] = []
+        environs.extend([environ] * request.weight)
+
+    # the component of each request is read from its first encoded page
+    components: List[Optional[str]] = [None] * len(environs)
+    for index, environ in enumerate(environs):
+        run_wsgi_app(app, environ, buffered=True)
+        pages = environ[PAGE_ENVIRON_KEY]
+        if components[index] is None:
+            components[index] = (
+                json.loads(pages[-1])["component"] if pages else environ["PATH_INFO"]
+            )
+        pages.clear()
+
+    measures: Dict[str, Dict[str, Any]] = {
+        component: {"latencies": [], "sizes": [], "errors": 0}
+        for component in components
+    }
+    start = time.perf_counter()
+    for index in range(count):
+        environ = environs[index % len(environs)]
+        request_start = time.perf_counter()
+        app_iter, status, _ = run_wsgi_app(app, environ, buffered=True)
+        latency = time.perf_counter() - request_start
+        environ[PAGE_ENVIRON_KEY].clear()
+
+        measure = measures[components[index % len(environs)]]
+        measure["latencies"].append(latency)
+        measure["sizes"].append(sum(len(chunk) for chunk in app_iter))
+        if int(status.split(" ", 1)[0]) >= 400:
+            measure["errors"] += 1
+
+    return time.perf_counter() - start, measures
+
+
+_worker_app = None
+
+
+def _init_worker(app_import_path: Optional[str], create_app: Optional[Callable]):
+    from flask.cli import ScriptInfo
+
+    global _worker_app
+    _worker_app = ScriptInfo(
+        app_import_path=app_import_path, create_app=create_app
+    ).load_app()
+
+
+def _run_worker(requests: List[BenchRequest], count: int) -> _Measures:
+    return run_requests(_worker_app, requests, count)
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+def run_bench(
+    app: Flask,
+    requests: List[BenchRequest],
+    count: int = 1000,
+    workers: int = 1,
+    app_import_path: Optional[str] = None,
+    create_app: Optional[Callable[[], Flask]] = None,
+) -> BenchReport:
+    """Replay requests against the application and report their measures.
+
+    With several workers, the requests are spread across a process pool, each
+    process loading the application like the Flask CLI does.
+
+    :param app: The Flask application, used when running with a single worker
+    :param requests: The requests to replay
+    :param count: The total number of measured requests
+    :param workers: The number of processes replaying the requests
+    :param app_import_path: The application import path loaded by the workers
+    :param create_app: The application factory called by the workers
+    """
+    if not requests:
+        raise ValueError("Bench needs at least one request.")
+
+    if workers <= 1:
+        results = [run_requests(app, requests, count)]
+    else:
+        counts = [count // workers + (i < count % workers) for i in range(workers)]
+        with ProcessPoolExecutor(
+            workers, initializer=_init_worker, initargs=(app_import_path, create_app)
+        ) as pool:
+            futures = [pool.submit(_run_worker, requests, n) for n in counts]
+            results = [future.result() for future in futures]
+
+    # workers run side by side, the run lasts as long as the slowest one
+    duration = max(worker_duration for worker_duration, _ in results)
+    merged: Dict[str, Dict[str, Any]] = {}
+    for _, measures in results:
+        for component, measure in measures.items():
+            if not measure["latencies"]:
+                continue
+            total = merged.setdefault(
+                component, {"latencies": [], "sizes": [], "errors": 0}
+            )
+            total["latencies"].extend(measure["latencies"])
+            total["sizes"].extend(measure["sizes"])
+            total["errors"] += measure["errors"]
+
+    components = {}
+    for component, measure in merged.items():
+        latencies = sorted(measure["latencies"])
+        components[component] = ComponentStats(
+            requests=len(latencies),
+            errors=measure["errors"],
+            throughput=len(latencies) / duration if duration else 0.0,
+            p50=_percentile(latencies, 50),
+            p95=_percentile(latencies, 95),
+            p99=_percentile(latencies, 99),
+            size=sum(measure["sizes"]) / len(latencies),
+        )
+
+    return BenchReport(count, duration, max(workers, 1), components)
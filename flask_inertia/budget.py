@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.budget
+--------------------
+
+Check the size of the encoded page objects against payload budgets.
+
+Budgets are set in bytes globally with ``INERTIA_PAYLOAD_BUDGET`` and per
+component with the ``INERTIA_PAYLOAD_BUDGETS`` mapping. When a budget is set,
+each top-level prop is encoded separately to measure its size. The
+``INERTIA_PAYLOAD_BUDGET_ACTION`` config value sets what happens when a page
+exceeds its budget:
+
+* ``"log"``: log a warning with the size of each prop (the default)
+* ``"raise"``: raise :class:`PayloadBudgetExceeded` (the default in debug mode)
+* ``"header"``: add a ``X-Inertia-Payload-Budget`` header to the response
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+from flask import g, has_request_context
+
+HEADER = "X-Inertia-Payload-Budget"
+
+
+class PayloadReport(NamedTuple):
+    """Size of an encoded page object and of each of its props."""
+
+    component: str
+    size: int
+    budget: int
+    props: Dict[str, int]
+
+    def format(self, limit: int = 10) -> str:
+        """Describe the report, listing the largest props first.
+
+        :param limit: Number of props listed
+        """
+        largest = sorted(self.props.items(), key=lambda item: item[1], reverse=True)
+        props = ", ".join(f"{key}={size}" for key, size in largest[:limit])
+        return (
+            f"{self.component} page is {self.size} bytes, "
+            f"over its {self.budget} bytes budget ({props})"
+        )
+
+
+class PayloadBudgetExceeded(Exception):
+    """Raised when a page object exceeds its payload budget.
+
+    :param report: The page payload report
+    """
+
+    def __init__(self, report: PayloadReport):
+        super().__init__(report.format())
+        self.report = report
+
+
+def get_payload_budget(app: Any, component_name: str) -> Optional[int]:
+    """Return the payload budget of a component, ``None`` if it has no budget.
+
+    :param app: The application
+    :param component_name: The component name
+    """
+    budgets = app.config.get("INERTIA_PAYLOAD_BUDGETS") or {}
+    return budgets.get(component_name, app.config.get("INERTIA_PAYLOAD_BUDGET"))
+
+
+def check_payload_budget(app: Any, report: PayloadReport):
+    """Report a page object exceeding its payload budget.
+
+    :param app: The application
+    :param report: The page payload report
+    """
+    if report.size <= report.budget:
+        return
+
+    action = app.config.get("INERTIA_PAYLOAD_BUDGET_ACTION")
+    if action is None:
+        action = "raise" if app.debug else "log"
+
+    if action == "raise":
+        raise PayloadBudgetExceeded(report)
+
+    if action == "header" and has_request_context():
+        g._inertia_payload_report = report
+    else:
+        app.logger.warning(report.format())
+
+
+def add_payload_header(response: Any) -> Any:
+    """Add the payload budget header to a response if its page exceeded its budget.
+
+    :param response: The generated response
+    """
+    report = g.pop("_inertia_payload_report", None)
+    if report is not None:
+        response.headers[HEADER] = report.format()
+
+    return response
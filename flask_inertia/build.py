@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.build
+-------------------
+
+Precompute Inertia artifacts at deploy time and load them at runtime.
+"""
+
+import json
+import os
+from typing import Dict, NamedTuple, Optional
+
+from flask import current_app
+from markupsafe import Markup
+
+MANIFEST_FILE = "manifest.json"
+ROUTER_FILE = "router.js"
+
+
+class Build(NamedTuple):
+    """Artifacts loaded from a build directory."""
+
+    version: str
+    router: Markup
+
+
+def write_build(output_dir: str) -> Dict[str, str]:
+    """Write the Inertia artifacts of the current application to a directory.
+
+    * ``router.js``: the minified router script, inlined by ``include_router``
+    * ``manifest.json``: the asset version and the artifacts file names
+
+    Returns the written manifest.
+
+    :param output_dir: The build directory, created if needed
+    """
+    from flask_inertia.core import render_router
+    from flask_inertia.version import compute_asset_version
+
+    os.makedirs(output_dir, exist_ok=True)
+    routes = {rule.endpoint: rule.rule for rule in current_app.url_map.iter_rules()}
+    router = render_router(routes)
+    with open(os.path.join(output_dir, ROUTER_FILE), "w") as router_file:
+        router_file.write(router)
+
+    manifest = {"version": compute_asset_version(), "router": ROUTER_FILE}
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    return manifest
+
+
+def read_build(build_dir: str) -> Optional[Build]:
+    """Load the artifacts written by ``write_build``.
+
+    Returns ``None`` if the directory does not contain a build.
+
+    :param build_dir: The build directory
+    """
+    manifest_path = os.path.join(build_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, "r") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    with open(os.path.join(build_dir, manifest["router"]), "r") as router_file:
+        router = Markup(router_file.read())
+
+    return Build(manifest["version"], router)
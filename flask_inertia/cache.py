@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.cache
+-------------------
+
+Provide a size bounded in-memory cache used to store Inertia responses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+from flask import Response, current_app
+
+
+class TTLCache:
+    """Thread-safe in-memory cache with a maximum size and an optional time to live.
+
+    The least recently used items are evicted once ``maxsize`` is reached.
+
+    :param maxsize: The maximum number of items stored in the cache
+    :param ttl: Default time to live of the items in seconds (``None`` to keep them
+                until eviction)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get_item(self, key: Hashable) -> Tuple[bool, Any]:
+        item = self._data.get(key)
+        if item is None:
+            return False, None
+
+        expires, value = item
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return False, None
+
+        return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get an item from the cache.
+
+        :param key: The item key
+        :param default: Value returned if the item is missing or expired
+        """
+        with self._lock:
+            found, value = self._get_item(key)
+            if not found:
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an item from the cache and return it.
+
+        :param key: The item key
+        :param default: Value returned if the item is missing or expired
+        """
+        with self._lock:
+            found, value = self._get_item(key)
+            if not found:
+                return default
+
+            del self._data[key]
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an item in the cache.
+
+        :param key: The item key
+        :param value: The item value
+        :param ttl: Time to live of the item in seconds (by default the cache ``ttl``)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Remove an item from the cache.
+
+        :param key: The item key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, predicate: Callable[[Any], bool]):
+        """Remove the items whose value matches a predicate.
+
+        :param predicate: Callable receiving an item value
+        """
+        with self._lock:
+            for key, (_, value) in list(self._data.items()):
+                if predicate(value):
+                    del self._data[key]
+
+    def clear(self):
+        """Remove all the items from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+class PageCache:
+    """In-memory store for rendered Inertia pages with tag-based invalidation.
+
+    Replace it with an object implementing the same methods to store pages in
+    another backend.
+
+    :param maxsize: The maximum number of pages stored in the cache
+    :param ttl: Default time to live of the pages in seconds
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        self._cache = TTLCache(maxsize, ttl)
+
+    def get(self, key: Hashable) -> Any:
+        """Get a page from the cache, ``None`` if it is missing or expired.
+
+        :param key: The page key
+        """
+        item = self._cache.get(key)
+        return None if item is None else item[1]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ):
+        """Store a page in the cache.
+
+        :param key: The page key
+        :param value: The page
+        :param ttl: Time to live of the page in seconds (by default the cache ``ttl``)
+        :param tags: Tags used to invalidate the page
+        """
+        self._cache.set(key, (frozenset(tags), value), ttl)
+
+    def invalidate(self, *tags: str):
+        """Remove the pages stored with any of the given tags.
+
+        :param tags: The tags to invalidate
+        """
+        self._cache.delete_matching(lambda item: not item[0].isdisjoint(tags))
+
+    def clear(self):
+        """Remove all the pages from the cache."""
+        self._cache.clear()
+
+
+def freeze_response(
+    response: Response, drop_cookies: bool = False
+) -> Tuple[bytes, int, list]:
+    """Extract the data needed to rebuild a response from the cache.
+
+    :param response: The response to store
+    :param drop_cookies: Drop the ``Set-Cookie`` headers, for responses replayed to
+                         the visitor they were generated for only
+    """
+    headers = [
+        (name, value)
+        for name, value in response.headers.items()
+        if not drop_cookies or name.lower() != "set-cookie"
+    ]
+    return response.get_data(), response.status_code, headers
+
+
+def thaw_response(frozen: Tuple[bytes, int, list]) -> Response:
+    """Rebuild a response stored in the cache.
+
+    :param frozen: The response data returned by ``freeze_response``
+    """
+    data, status, headers = frozen
+    return current_app.response_class(data, status=status, headers=headers)
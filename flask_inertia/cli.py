@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.cli
+-----------------
+
+Flask CLI commands registered by the Inertia extension.
+"""
+
+import json
+import os
+
+import click
+from flask import current_app
+from flask.cli import AppGroup, ScriptInfo
+
+from flask_inertia.build import write_build
+
+inertia_cli = AppGroup("inertia", help="Flask-Inertia commands.")
+
+
+@inertia_cli.command("build")
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(file_okay=False),
+    help="Build directory (by default INERTIA_BUILD_DIR).",
+)
+def build_command(output):
+    """Precompute the router script and the asset version."""
+    output = output or current_app.config.get("INERTIA_BUILD_DIR")
+    if not output:
+        raise click.UsageError("Set INERTIA_BUILD_DIR in config or use --output.")
+
+    manifest = write_build(output)
+    click.echo(
+        f"Inertia artifacts written to {output} (version {manifest['version']})"
+    )
+
+
+@inertia_cli.command("bench")
+@click.argument("paths", nargs=-1)
+@click.option(
+    "-s",
+    "--scenario",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON file declaring the requests to replay.",
+)
+@click.option(
+    "-k",
+    "--kind",
+    type=click.Choice(["visit", "navigate"]),
+    default="visit",
+    show_default=True,
+    help="Kind of the requests to the given paths.",
+)
+@click.option("-n", "--requests", "count", default=1000, show_default=True, type=int)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    help="Number of processes (by default the number of CPUs).",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the report as JSON to this file.",
+)
+@click.pass_context
+def bench_command(ctx, paths, scenario, kind, count, workers, output):
+    """Replay Inertia requests in-process and report their latency."""
+    # the bench harness is only needed by this command
+    from flask_inertia.bench import BenchRequest, load_scenario, run_bench
+
+    requests = [BenchRequest(path, kind) for path in paths]
+    if scenario:
+        try:
+            requests.extend(load_scenario(scenario))
+        except (KeyError, ValueError) as err:
+            raise click.BadParameter(str(err), param_hint="--scenario")
+    if not requests:
+        raise click.UsageError("Give the paths to request or a --scenario file.")
+
+    info = ctx.find_object(ScriptInfo)
+    report = run_bench(
+        current_app._get_current_object(),
+        requests,
+        count=count,
+        workers=workers or os.cpu_count() or 1,
+        app_import_path=info.app_import_path if info else None,
+        create_app=info.create_app if info else None,
+    )
+    click.echo(report.format())
+    if output:
+        with open(output, "w") as output_file:
+            json.dump(report.to_dict(), output_file, indent=2)
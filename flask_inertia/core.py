@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.core
+------------------
+
+Framework-agnostic implementation of the Inertia protocol.
+
+Those functions only work on request headers and plain data, they are shared by
+the Flask extension and the Quart adapter. Both extensions inherit their state
+from :class:`InertiaBase`, which reaches the framework through a few accessors.
+"""
+
+import hashlib
+import os
+import threading
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from markupsafe import Markup
+from werkzeug.datastructures import Headers
+from werkzeug.exceptions import BadRequest
+
+from flask_inertia.build import read_build
+from flask_inertia.cache import TTLCache
+from flask_inertia.encoding import SerializerRegistry, extend_json_provider
+from flask_inertia.props import (
+    AlwaysProp,
+    DeferredProp,
+    DependentProp,
+    LazyProp,
+    RevalidatingProp,
+)
+from flask_inertia.singleflight import SingleFlight
+
+
+def get_partial_keys(headers: Headers, component_name: str) -> Optional[List[str]]:
+    """Get the props requested by a partial reload of the component.
+
+    Returns ``None`` if the request is not a partial reload of the component.
+
+    :param headers: The request headers
+    :param component_name: The component name used in your frontend framework
+    """
+    refresh_props = headers.getlist("X-Inertia-Partial-Data")
+    if len(refresh_props) == 1 and "," in refresh_props[0]:
+        refresh_props = list(
+            filter(None, headers.get("X-Inertia-Partial-Data", "").split(","))
+        )
+    if (
+        refresh_props
+        and headers.get("X-Inertia-Partial-Component", "") == component_name
+    ):
+        return refresh_props
+
+    return None
+
+
+def select_props(
+    partial_keys: Optional[List[str]], props: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Filter component props according to Inertia partial reload headers.
+
+    :param partial_keys: The props requested by a partial reload
+    :param props: A dict of properties used in your component
+    """
+    if partial_keys is not None:
+        return {
+            key: value
+            for key, value in props.items()
+            if key in partial_keys or isinstance(value, AlwaysProp)
+        }
+
+    return {
+        key: value
+        for key, value in props.items()
+        if not callable(value) or not isinstance(value, LazyProp)
+    }
+
+
+def get_deferred_props(props: Mapping[str, Any]) -> Dict[str, List[str]]:
+    """List the deferred props keys by group.
+
+    :param props: A dict of properties used in your component
+    """
+    deferred_props = {}
+    for key, value in props.items():
+        if isinstance(value, DeferredProp):
+            deferred_props.setdefault(value.group, []).append(key)
+
+    return deferred_props
+
+
+def build_page(
+    component_name: str,
+    url: str,
+    version: str,
+    props: Mapping[str, Any],
+    partial_keys: Optional[List[str]],
+) -> Dict[str, Any]:
+    """Build an Inertia page object, without its props.
+
+    :param component_name: The component name used in your frontend framework
+    :param url: The page URL
+    :param version: The current asset version
+    :param props: All the component props, used to list the deferred props
+    :param partial_keys: The props requested by a partial reload
+    """
+    page = {"component": component_name, "url": url, "version": version}
+    if partial_keys is None:
+        deferred_props = get_deferred_props(props)
+        if deferred_props:
+            page["deferredProps"] = deferred_props
+
+    return page
+
+
+def defer_prop(page: Dict[str, Any], key: str, group: str):
+    """Add a prop to the deferred props of a page.
+
+    :param page: The Inertia page object
+    :param key: The prop key
+    :param group: Name of the group the prop is fetched with
+    """
+    page.setdefault("deferredProps", {}).setdefault(group, []).append(key)
+
+
+def is_inertia_xhr(headers: Headers) -> bool:
+    """Check if a request is an AJAX request sent by Inertia.
+
+    AJAX requests not sent by Inertia are rejected.
+
+    :param headers: The request headers
+    """
+    # request is ajax
+    if headers.get("X-Requested-With") != "XMLHttpRequest":
+        return False
+
+    # check if send with Inertia
+    if not headers.get("X-Inertia"):
+        raise BadRequest("Inertia headers not found")
+
+    return True
+
+
+def is_stale_version(method: str, headers: Headers, server_version: str) -> bool:
+    """Check if the client asset version of an Inertia GET request is outdated.
+
+    The client must then make a full page visit.
+
+    :param method: The request method
+    :param headers: The request headers
+    :param server_version: The current asset version
+    """
+    inertia_version = headers.get("X-Inertia-Version")
+    return (
+        method == "GET"
+        and bool(inertia_version)
+        and inertia_version != server_version
+    )
+
+
+def redirect_status(method: str, status_code: int) -> int:
+    """Return the status of a redirection, 303 for redirections after a PUT, PATCH or DELETE.
+
+    409 conflict responses are only sent for GET requests, and not for
+    POST/PUT/PATCH/DELETE requests. That said, they will be sent in the
+    event that a GET redirect occurs after one of these requests. To force
+    Inertia to use a GET request after a redirect, the 303 HTTP status is used.
+
+    :param method: The request method
+    :param status_code: The response status code
+    """
+    if method in ["PUT", "PATCH", "DELETE"] and status_code == HTTPStatus.FOUND:
+        return HTTPStatus.SEE_OTHER
+
+    return status_code
+
+
+def hash_template(template_path: str) -> str:
+    """Hash the Inertia template to calculate the asset version.
+
+    :param template_path: Path of the Inertia template
+    """
+    with open(template_path, "rb") as template_file:
+        bytes_content = template_file.read()
+
+    return hashlib.sha256(bytes_content).hexdigest()
+
+
+def get_template_path(app: Any) -> str:
+    """Return the path of the Inertia template of an application.
+
+    :param app: The Flask or Quart application
+    """
+    return os.path.join(
+        app.root_path, app.template_folder, app.config["INERTIA_TEMPLATE"]
+    )
+
+
+def render_router(routes: Dict[str, str]) -> str:
+    """Render and minify the JS router script.
+
+    :param routes: The application URL rules by endpoint
+    """
+    from jinja2 import Template
+    from jsmin import jsmin
+
+    router_file = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), "router.js"
+    )
+    with open(router_file, "r") as jsfile:
+        template = Template(jsfile.read())
+
+    # Jinja2 template automatically get rid of ['<'|'>'] chars
+    content = (
+        template.render(routes=routes)
+        .replace("\\u003c", "<")
+        .replace("\\u003e", ">")
+    )
+    return jsmin(content)
+
+
+class InertiaBase:
+    """State and methods shared by the Flask extension and the Quart adapter.
+
+    Subclasses give access to the framework through ``_current_app``,
+    ``_request_globals`` and ``_call_in_app_context``.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.serializers = SerializerRegistry()
+        self._resources: Dict[str, Callable] = {}
+
+    def init_app(self, app: Any):
+        """Reset the extension state for an application.
+
+        * Load the build artifacts if ``INERTIA_BUILD_DIR`` is set
+        * Extend the application JSON provider to encode pages with the extension
+          serializers, logging a warning if the provider can not be extended (see
+          :func:`~flask_inertia.encoding.extend_json_provider`)
+
+        :param app: The Flask or Quart application
+        """
+        self.app = app
+        self._shared_data = {}
+        self._shared_revision = 0
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._validated_json = TTLCache(
+            app.config.get("INERTIA_RAW_JSON_CACHE_SIZE", 1024)
+        )
+        self._router = None
+        self._asset_versions = {}
+        self._build = None
+        build_dir = app.config.get("INERTIA_BUILD_DIR")
+        if build_dir:
+            self._build = read_build(build_dir)
+        self._json_extended = extend_json_provider(app)
+        if not self._json_extended:
+            app.logger.warning(
+                "The %s JSON provider does not inherit from DefaultJSONProvider, "
+                "Inertia pages are encoded without the extension serializers.",
+                type(app.json).__name__,
+            )
+
+    def _current_app(self) -> Any:
+        """Return the application handling the current request."""
+        raise NotImplementedError
+
+    def _request_globals(self) -> Optional[Any]:
+        """Return the ``g`` object of the current request, ``None`` outside of requests."""
+        raise NotImplementedError
+
+    def _call_in_app_context(self, func: Callable) -> Any:
+        """Call a function in an application context, from a worker thread.
+
+        :param func: The function to call
+        """
+        raise NotImplementedError
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool running props in the background.
+
+        The pool is created on first use, its size is set by the
+        ``INERTIA_MAX_WORKERS`` config value.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self._current_app().config.get("INERTIA_MAX_WORKERS"),
+                    thread_name_prefix="inertia",
+                )
+
+        return self._executor
+
+    def share(self, key: str, value: Any, max_age: Optional[float] = None):
+        """Preassign shared data for each request.
+
+        Sometimes you need to access certain data on numerous pages within your
+        application. For example, a common use-case for this is showing the
+        current user in the site header. Passing this data manually in each
+        response isn't practical. In these situations shared data can be useful.
+
+        When called while handling a request (i.e. in a ``before_request`` hook),
+        the data is only shared for this request and overrides the data shared
+        globally.
+
+        Expensive data tolerating some staleness can be shared with a ``max_age``:
+        the value is computed once then served from cache. Once older than
+        ``max_age`` it is still served while a background worker refreshes it, so
+        that no request waits for the computation. The function is called in an
+        application context, it must not depend on the request. Such data must be
+        shared globally, not while handling a request.
+
+        .. code-block:: python
+
+           inertia.share("menu", get_menu_tree, max_age=300)
+
+        :param key: Data key to share between requests
+        :param value: Data value or Function returning the data value
+        :param max_age: Time in seconds the value returned by the function is fresh
+        """
+        request_globals = self._request_globals()
+        if max_age is not None:
+            if not callable(value):
+                raise ValueError("Shared ``value`` must be a callable to be cached.")
+            if request_globals is not None:
+                raise RuntimeError("Data shared with a ``max_age`` must be global.")
+            value = RevalidatingProp(value, max_age)
+
+        if request_globals is not None:
+            request_globals.setdefault("_inertia_shared", {})[key] = value
+        else:
+            self._shared_data[key] = value
+            self._shared_revision += 1
+
+    def get_shared_data(self) -> ChainMap:
+        """Get the data shared for the current request layered over the global one."""
+        request_globals = self._request_globals()
+        if request_globals is not None:
+            return ChainMap(
+                request_globals.get("_inertia_shared", {}), self._shared_data
+            )
+
+        return ChainMap(self._shared_data)
+
+    def serializer(self, cls: type) -> Callable:
+        """Register a serializer converting the objects of a type in props.
+
+        .. code-block:: python
+
+           @inertia.serializer(Money)
+           def serialize_money(money):
+               return {"amount": str(money.amount), "currency": money.currency}
+
+        :param cls: The type to convert, subclasses included
+        """
+        return self.serializers.register(cls)
+
+    def reference(self, cls: type, key: Union[str, Callable]) -> None:
+        """Declare the key identifying the objects of a type in normalized props.
+
+        Distinct objects sharing a same key are sent once in the page reference
+        table, see :func:`~flask_inertia.views.render_inertia` ``normalize``.
+
+        .. code-block:: python
+
+           inertia.reference(User, key="id")
+
+        :param cls: The referenced type, subclasses included
+        :param key: Name of the attribute identifying an object or a callable
+                    returning it
+        """
+        self.serializers.register_reference(cls, key)
+
+    def resource(self, name: str, *dependencies: str) -> Callable:
+        """Register a request-scoped resource props can depend on.
+
+        A resource is evaluated at most once per request, only if a prop sent in
+        the response depends on it. With the Quart adapter, the factory can be a
+        coroutine function.
+
+        .. code-block:: python
+
+           @inertia.resource("orders")
+           def orders():
+               return Order.query.all()
+
+           render_inertia(
+               "Orders",
+               props={
+                   "orders": depends_include(lambda orders: orders, "orders"),
+                   "count": depends_include(lambda orders: len(orders), "orders"),
+               },
+           )
+
+        :param name: The resource name
+        :param dependencies: Names of the resources or props the resource depends on
+        """
+
+        def decorator(factory: Callable) -> Callable:
+            self._resources[name] = (
+                DependentProp(factory, dependencies) if dependencies else factory
+            )
+            return factory
+
+        return decorator
+
+    def get_asset_version(self) -> str:
+        """Return the asset version, read from the build artifacts or the template hash.
+
+        The hash is cached unless templates are auto reloaded (i.e. in debug mode).
+        """
+        if self._build is not None:
+            return self._build.version
+
+        app = self._current_app()
+        template_path = get_template_path(app)
+        if template_path not in self._asset_versions or app.jinja_env.auto_reload:
+            self._asset_versions[template_path] = hash_template(template_path)
+
+        return self._asset_versions[template_path]
+
+    def include_router(self) -> Markup:
+        """Include JS router in Templates.
+
+        The minified router script is cached until the application routes change,
+        or read from the build artifacts if ``INERTIA_BUILD_DIR`` is set.
+        """
+        if self._build is not None:
+            return self._build.router
+
+        routes = {
+            rule.endpoint: rule.rule
+            for rule in self._current_app().url_map.iter_rules()
+        }
+        routes_key = tuple(routes.items())
+        if self._router is None or self._router[0] != routes_key:
+            self._router = (routes_key, Markup(render_router(routes)))
+
+        return self._router[1]
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.encoding
+----------------------
+
+Encode Inertia page objects, converting props objects with cached serializers.
+"""
+
+import dataclasses
+import datetime
+import decimal
+import enum
+import functools
+import json
+import operator
+import re
+import secrets
+import uuid
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.datastructures import MIMEAccept
+
+from flask_inertia.budget import (
+    PayloadReport,
+    check_payload_budget,
+    get_payload_budget,
+)
+from flask_inertia.props import RawJSON, RawJSONProp, TableProp
+
+MSGPACK_MIMETYPES = ("application/x-msgpack", "application/msgpack")
+
+#: WSGI environ key of the list recording the encoded pages in tests
+PAGE_ENVIRON_KEY = "flask_inertia.pages"
+
+
+class Page(dict):
+    """Inertia page object, encoded by the extension serializers.
+
+    When ``normalize`` is set, the objects repeated in props are moved to a
+    reference table while the page is encoded.
+    """
+
+    normalize = False
+
+
+class SerializerRegistry:
+    """Convert objects that can not be encoded in JSON into encodable values.
+
+    The converter of a type is resolved the first time an object of this type is
+    encoded, then cached. Registered serializers are looked up along the type MRO,
+    then built-in converters handle dataclasses, attrs classes, SQLAlchemy rows and
+    models, non-tuple objects exposing ``_asdict``, enums, times (in ISO 8601
+    format), decimals, UUIDs, sets and tables nested in other props. Dates are left
+    to the fallback, which sends them in the HTTP date format like Flask. Named
+    tuples are encoded as lists by the JSON encoder itself. Converted objects are
+    shallow: their attributes are converted in turn by the encoder.
+
+    :param fallback: Called for objects without converter (by default Flask
+                     ``DefaultJSONProvider.default``)
+    """
+
+    def __init__(self, fallback: Optional[Callable[[Any], Any]] = None):
+        self.fallback = fallback or DefaultJSONProvider.default
+        self._serializers: Dict[type, Callable[[Any], Any]] = {}
+        self._converters: Dict[type, Optional[Callable[[Any], Any]]] = {}
+        self._references: Dict[type, Callable[[Any], Any]] = {}
+        self._reference_keys: Dict[type, Optional[Callable[[Any], Hashable]]] = {}
+
+    def register(self, cls: type, serializer: Optional[Callable] = None) -> Callable:
+        """Register a serializer for a type and its subclasses.
+
+        Can be used as a decorator:
+
+        .. code-block:: python
+
+           @inertia.serializers.register(Money)
+           def serialize_money(money):
+               return {"amount": str(money.amount), "currency": money.currency}
+
+        :param cls: The type to convert
+        :param serializer: Callable converting an object into an encodable value
+        """
+
+        def decorator(serializer: Callable) -> Callable:
+            self._serializers[cls] = serializer
+            self._converters.clear()
+            return serializer
+
+        if serializer is not None:
+            return decorator(serializer)
+
+        return decorator
+
+    def register_reference(self, cls: type, key: Union[str, Callable]) -> None:
+        """Declare the key identifying the objects of a type and its subclasses.
+
+        When props are normalized, objects of this type sharing a same key are
+        sent once in the page reference table, even if they are distinct
+        instances.
+
+        :param cls: The referenced type
+        :param key: Name of the attribute identifying an object or a callable
+                    returning it
+        """
+        self._references[cls] = (
+            operator.attrgetter(key) if isinstance(key, str) else key
+        )
+        self._reference_keys.clear()
+
+    def reference_key(self, obj: Any) -> Optional[Hashable]:
+        """Return the declared key identifying an object, ``None`` if undeclared.
+
+        :param obj: The referenced object
+        """
+        cls = type(obj)
+        try:
+            getter = self._reference_keys[cls]
+        except KeyError:
+            getter = self._reference_keys[cls] = self._compile_reference(cls)
+
+        return None if getter is None else getter(obj)
+
+    def _compile_reference(self, cls: type) -> Optional[Callable[[Any], Hashable]]:
+        for base in cls.__mro__:
+            if base in self._references:
+                key = self._references[base]
+                return lambda obj: (base, key(obj))
+
+        return None
+
+    def default(
+        self, obj: Any, fallback: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """Convert an object, usable as ``json.dumps`` ``default`` argument.
+
+        :param obj: The object to convert
+        :param fallback: Called instead of the registry ``fallback`` for objects
+                         without converter
+        """
+        cls = type(obj)
+        try:
+            converter = self._converters[cls]
+        except KeyError:
+            converter = self._converters[cls] = self._compile(cls)
+
+        if converter is None:
+            return (fallback or self.fallback)(obj)
+
+        return converter(obj)
+
+    def _compile(self, cls: type) -> Optional[Callable[[Any], Any]]:
+        for base in cls.__mro__:
+            if base in self._serializers:
+                return self._serializers[base]
+
+        for predicate, factory in _CONVERTERS:
+            if predicate(cls):
+                return factory(cls)
+
+        return None
+
+
+_SCALARS = (str, int, float, bool, type(None), RawJSON)
+
+
+class _Normalizer:
+    """Move the objects repeated in props to a reference table.
+
+    A first pass counts how many times each mapping or object is found in the
+    props, identified by their declared key or their identity. The second pass
+    copies the props, replacing the repeated ones by ``{"$ref": id}`` pointers and
+    storing them once in the reference table.
+    """
+
+    def __init__(self, serializers: SerializerRegistry):
+        self.serializers = serializers
+        self.refs: Dict[str, Any] = {}
+        self._counts: Dict[Hashable, int] = {}
+        self._ref_ids: Dict[Hashable, str] = {}
+        self._converted: Dict[int, Tuple[Any, Optional[Hashable], Any]] = {}
+
+    def _identify(self, value: Any) -> Tuple[Optional[Hashable], Any]:
+        """Return the identity of a referenceable value and its encodable value."""
+        if isinstance(value, dict):
+            return id(value), value
+
+        if isinstance(value, _SCALARS + (list, tuple)):
+            return None, value
+
+        try:
+            _, ident, converted = self._converted[id(value)]
+        except KeyError:
+            converted = self.serializers.default(value)
+            ident = None
+            if isinstance(converted, dict):
+                ident = self.serializers.reference_key(value)
+                if ident is None:
+                    ident = id(value)
+            # keep the object alive so that its identity is not reused
+            self._converted[id(value)] = (value, ident, converted)
+
+        return ident, converted
+
+    def count(self, value: Any) -> None:
+        ident, value = self._identify(value)
+        if ident is not None:
+            seen = self._counts.get(ident, 0)
+            self._counts[ident] = seen + 1
+            if seen:
+                return
+
+        if isinstance(value, dict):
+            for item in value.values():
+                self.count(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.count(item)
+
+    def emit(self, value: Any) -> Any:
+        ident, value = self._identify(value)
+        if ident is not None and self._counts[ident] > 1:
+            ref = self._ref_ids.get(ident)
+            if ref is None:
+                ref = self._ref_ids[ident] = str(len(self._ref_ids))
+                self.refs[ref] = self._emit_items(value)
+            return {"$ref": ref}
+
+        return self._emit_items(value)
+
+    def _emit_items(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self.emit(item) for key, item in value.items()}
+
+        if isinstance(value, (list, tuple)):
+            return [self.emit(item) for item in value]
+
+        return value
+
+
+def normalize_props(
+    props: Dict[str, Any], serializers: SerializerRegistry
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Move the objects found more than once in props to a reference table.
+
+    Returns the normalized props, where repeated objects are replaced by
+    ``{"$ref": id}`` pointers, and the reference table mapping ids to objects.
+
+    :param props: The evaluated page props
+    :param serializers: Registry used to convert objects and identify referenced
+                        types
+    """
+    normalizer = _Normalizer(serializers)
+    normalizer.count(props)
+    normalized = normalizer._emit_items(props)
+    return normalized, normalizer.refs
+
+
+class _Splicer:
+    """Splice raw JSON fragments into an encoded page.
+
+    Fragments are encoded as unique placeholder strings, replaced by the fragments
+    text once the page is encoded.
+
+    :param default: Converter called for the other objects
+    """
+
+    def __init__(self, default: Callable[[Any], Any]):
+        self._default = default
+        self._fragments: List[str] = []
+        self._prefix = ""
+
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, RawJSON):
+            if not self._prefix:
+                self._prefix = f"__inertia_raw_{secrets.token_hex(8)}_"
+            self._fragments.append(obj.text)
+            return f"{self._prefix}{len(self._fragments) - 1}"
+
+        return self._default(obj)
+
+    def splice(self, data: str) -> str:
+        if not self._fragments:
+            return data
+
+        pattern = re.compile(f'"{self._prefix}(\\d+)"')
+        return pattern.sub(lambda match: self._fragments[int(match[1])], data)
+
+
+def _fields_extractor(fields: Tuple[str, ...]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a callable extracting the given attributes of an object as a dict.
+
+    :param fields: The attributes names
+    """
+    if len(fields) == 1:
+        (field,) = fields
+        return lambda obj: {field: getattr(obj, field)}
+
+    getter = operator.attrgetter(*fields)
+    return lambda obj: dict(zip(fields, getter(obj)))
+
+
+# built-in converters in priority order, each a predicate on the type and a
+# factory returning the converter of the type
+_CONVERTERS = (
+    (
+        lambda cls: issubclass(cls, (TableProp, RawJSONProp)),
+        lambda cls: operator.methodcaller("__call__"),
+    ),
+    (
+        dataclasses.is_dataclass,
+        lambda cls: _fields_extractor(
+            tuple(f.name for f in dataclasses.fields(cls))
+        ),
+    ),
+    (
+        lambda cls: hasattr(cls, "__attrs_attrs__"),
+        lambda cls: _fields_extractor(tuple(a.name for a in cls.__attrs_attrs__)),
+    ),
+    (
+        lambda cls: hasattr(cls, "__mapper__"),
+        lambda cls: _fields_extractor(
+            tuple(attr.key for attr in cls.__mapper__.column_attrs)
+        ),
+    ),
+    (
+        lambda cls: hasattr(cls, "_asdict"),
+        lambda cls: operator.methodcaller("_asdict"),
+    ),
+    (
+        lambda cls: hasattr(cls, "_mapping"),
+        lambda cls: lambda obj: dict(obj._mapping),
+    ),
+    (
+        lambda cls: issubclass(cls, enum.Enum),
+        lambda cls: operator.attrgetter("value"),
+    ),
+    (
+        lambda cls: issubclass(cls, datetime.time),
+        lambda cls: operator.methodcaller("isoformat"),
+    ),
+    (lambda cls: issubclass(cls, (decimal.Decimal, uuid.UUID)), lambda cls: str),
+    (lambda cls: issubclass(cls, (set, frozenset)), lambda cls: list),
+)
+
+
+class InertiaJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding Inertia pages with the extension serializers.
+
+    Raw JSON props are spliced verbatim into the encoded page, and the pages size
+    is checked against their payload budget. The encoded pages are recorded for
+    the requests of :class:`flask_inertia.unittest.InertiaTestClient`. Other
+    objects are encoded like with the default Flask provider.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON to a string.
+
+        :param obj: The data to serialize.
+        :param kwargs: Passed to :func:`json.dumps`.
+        """
+        if not isinstance(obj, Page):
+            return super().dumps(obj, **kwargs)
+
+        encoded_page = self._dumps_page(obj, **kwargs)
+        if has_request_context() and PAGE_ENVIRON_KEY in request.environ:
+            request.environ[PAGE_ENVIRON_KEY].append(encoded_page)
+
+        return encoded_page
+
+    def _dumps_page(self, obj: Page, **kwargs: Any) -> str:
+        serializers = self._app.extensions["inertia"].serializers
+        # objects without converter are left to the provider, which may be a subclass
+        splicer = _Splicer(
+            functools.partial(serializers.default, fallback=self.default)
+        )
+        kwargs.setdefault("default", splicer.default)
+        obj = _normalize_page(obj, serializers)
+        budget = get_payload_budget(self._app, obj["component"])
+        if budget is None:
+            return splicer.splice(super().dumps(obj, **kwargs))
+
+        # props are encoded one by one to measure them, then spliced in the page
+        item_separator, key_separator = kwargs.get("separators") or (
+            (",", ": ") if kwargs.get("indent") is not None else (", ", ": ")
+        )
+        dumps = super().dumps
+        props = obj["props"]
+        keys = sorted(props) if kwargs.get("sort_keys", self.sort_keys) else props
+        encoded_props = {
+            key: dumps(key, **kwargs)
+            + key_separator
+            + splicer.splice(dumps(props[key], **kwargs))
+            for key in keys
+        }
+        encoded_page = splicer.splice(
+            dumps(
+                Page(
+                    obj,
+                    props=RawJSON(
+                        f"{{{item_separator.join(encoded_props.values())}}}"
+                    ),
+                ),
+                **kwargs,
+            )
+        )
+        report = PayloadReport(
+            obj["component"],
+            len(encoded_page),
+            budget,
+            {key: len(encoded) for key, encoded in encoded_props.items()},
+        )
+        check_payload_budget(self._app, report)
+        return encoded_page
+
+
+def extend_json_provider(app: Any) -> bool:
+    """Make the JSON provider of an application encode pages like ``InertiaJSONProvider``.
+
+    The default Flask provider is replaced by ``InertiaJSONProvider``. A subclass of
+    it is replaced by a provider inheriting from both classes, keeping its
+    attributes. Returns ``False`` for other providers, which encode pages without
+    the extension serializers.
+
+    :param app: The Flask or Quart application
+    """
+    provider = app.json
+    if isinstance(provider, InertiaJSONProvider):
+        return True
+
+    if not isinstance(provider, DefaultJSONProvider):
+        return False
+
+    app.json = _inertia_provider_class(type(provider))(app)
+    app.json.__dict__.update(provider.__dict__)
+    if "jinja_env" in app.__dict__:
+        app.jinja_env.policies["json.dumps_function"] = app.json.dumps
+
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _inertia_provider_class(cls: type) -> type:
+    if cls is DefaultJSONProvider:
+        return InertiaJSONProvider
+
+    return type(cls.__name__, (InertiaJSONProvider, cls), {})
+
+
+def _normalize_page(page: Page, serializers: SerializerRegistry) -> Page:
+    """Return the page with normalized props if its normalization is enabled.
+
+    :param page: The Inertia page object
+    :param serializers: Registry used to convert objects
+    """
+    if not page.normalize:
+        return page
+
+    props, refs = normalize_props(page["props"], serializers)
+    page = Page(page, props=props)
+    if refs:
+        page["refs"] = refs
+
+    return page
+
+
+@functools.lru_cache(maxsize=None)
+def _get_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        return None
+
+    return msgpack
+
+
+def negotiate_msgpack(accept_mimetypes: MIMEAccept) -> Optional[str]:
+    """Return the MessagePack mimetype preferred to JSON by a request.
+
+    Returns ``None`` if the request accepts JSON as well or better, or if the
+    ``msgpack`` package is not installed.
+
+    :param accept_mimetypes: The request ``Accept`` header
+    """
+    if _get_msgpack() is None:
+        return None
+
+    best = accept_mimetypes.best_match(("application/json",) + MSGPACK_MIMETYPES)
+    return best if best in MSGPACK_MIMETYPES else None
+
+
+def dumps_msgpack(page: Page, serializers: SerializerRegistry) -> bytes:
+    """Serialize an Inertia page object as MessagePack.
+
+    Props objects are converted by the serializers, raw JSON props are decoded to
+    be packed.
+
+    :param page: The Inertia page object
+    :param serializers: Registry used to convert objects
+    """
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, RawJSON):
+            return json.loads(obj.text)
+
+        return serializers.default(obj)
+
+    page = _normalize_page(page, serializers)
+    return _get_msgpack().packb(page, default=default)
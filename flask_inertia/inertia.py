@@ -30,43 +30,133 @@ flask_inertia.inertia
 Create a Flask extension to bind Flask and InertiaJS.
 """
 
-import os
+import functools
+from collections import defaultdict
 from http import HTTPStatus
-from typing import Any, Optional
-
-from flask import Flask, Response, current_app, request
-from jinja2 import Template
-from jsmin import jsmin
-from markupsafe import Markup
-from werkzeug.exceptions import BadRequest
-
-from flask_inertia.version import get_asset_version
-from flask_inertia.views import render_inertia
-
-
-class Inertia:
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from flask import (
+    Flask,
+    Response,
+    current_app,
+    g,
+    has_request_context,
+    request,
+    session,
+)
+
+from flask_inertia.batch import batch_reload
+from flask_inertia.budget import add_payload_header
+from flask_inertia.cache import PageCache, TTLCache, freeze_response, thaw_response
+from flask_inertia.cli import inertia_cli
+from flask_inertia.core import (
+    InertiaBase,
+    is_inertia_xhr,
+    is_stale_version,
+    redirect_status,
+)
+from flask_inertia.encoding import negotiate_msgpack
+from flask_inertia.live import Broker, LocalBroker, live_stream, snapshot
+from flask_inertia.props import DeferredProp
+from flask_inertia.version import VersionGate, get_asset_version
+
+
+class RegisteredPage(NamedTuple):
+    """Options of a page registered in the extension."""
+
+    component_name: str
+    cache: Union[bool, Dict[str, Any]]
+    deferred: Tuple[str, ...]
+
+
+class Inertia(InertiaBase):
     """Inertia Plugin for Flask."""
 
     def __init__(self, app: Optional[Flask] = None):
-        self.app = None
+        super().__init__()
+        self.pages: Dict[str, RegisteredPage] = {}
+        self.broker: Broker = LocalBroker()
+        self._live_sources: Dict[str, Dict[str, Callable]] = defaultdict(dict)
+        self._live_values: Dict[str, Dict[str, str]] = defaultdict(dict)
+        self.profile_sink: Optional[Callable[[Any], None]] = None
         if app is not None:
             self.init_app(app)
 
-    def init_app(self, app: Flask):
+    def init_app(self, app: Flask, precompute: bool = False):
         """Init as an app extension
 
         * Register before_request hook
-        * Register after_request hook
+        * Register after_request hooks
         * Set context processor to have an `inertia` value in templates
+        * Register the live props endpoint if ``INERTIA_LIVE_URL`` is set
+        * Register the batch reload endpoint if ``INERTIA_BATCH_URL`` is set
+        * Register the ``flask inertia`` CLI commands
+        * Extend the application JSON provider to encode pages with the extension
+          serializers
+        * Load the build artifacts if ``INERTIA_BUILD_DIR`` is set
+        * Answer the requests of outdated clients before dispatching them if
+          ``INERTIA_VERSION_GATE`` is set (see ``VersionGate``)
+        * Report slow profiled renders to ``INERTIA_PROFILE_DIR`` if set, or to the
+          application logger, unless ``profile_sink`` is set. The profiling module is
+          only imported if ``INERTIA_PROFILE_SAMPLE_RATE`` is set
+
+        :param app: The Flask application
+        :param precompute: Precompute the asset version and the router script (see
+                           ``warm_up``)
         """
-        self.app = app
-        self._shared_data = {}
+        super().init_app(app)
+        self._prefetch_cache = None
+        self._shorthand_cache = TTLCache(
+            app.config.get("INERTIA_SHORTHAND_CACHE_SIZE", 128)
+        )
+        self.page_cache = PageCache(
+            app.config.get("INERTIA_PAGE_CACHE_SIZE", 512),
+            app.config.get("INERTIA_PAGE_CACHE_TTL", 60),
+        )
         if not hasattr(app, "extensions"):
             app.extensions = {}
+        profiling = bool(app.config.get("INERTIA_PROFILE_SAMPLE_RATE"))
+        if self.profile_sink is None and profiling:
+            from flask_inertia.profiling import default_sink
+
+            self.profile_sink = default_sink(app)
+
         app.extensions["inertia"] = self
         app.context_processor(self.context_processor)
         app.before_request(self.process_incoming_inertia_requests)
         app.after_request(self.update_redirect)
+        app.after_request(self.cache_prefetch_response)
+        app.after_request(add_payload_header)
+        app.cli.add_command(inertia_cli)
+        if app.config.get("INERTIA_VERSION_GATE", False):
+            app.wsgi_app = VersionGate(app.wsgi_app, app)
+
+        live_url = app.config.get("INERTIA_LIVE_URL")
+        if live_url:
+            app.add_url_rule(
+                f"{live_url.rstrip('/')}/<path:channel>",
+                "inertia_live",
+                self.live_stream,
+            )
+
+        batch_url = app.config.get("INERTIA_BATCH_URL")
+        if batch_url:
+            app.add_url_rule(
+                batch_url, "inertia_batch", self.batch_reload, methods=["POST"]
+            )
+
+        if precompute:
+            self.warm_up(app)
 
     def process_incoming_inertia_requests(self) -> Optional[Response]:
         """Process incoming Inertia requests.
@@ -78,31 +168,89 @@ class Inertia:
         the request simply continues as expected. However, if they are different,
         the server immediately returns a 409 Conflict response (only for GET request),
         and includes the URL in a X-Inertia-Location header.
+
+        If the prefetch cache is enabled, a visit following a prefetch request of
+        the same page is served with the prefetched response.
+
+        If the ``INERTIA_REGISTERED_PAGES_ONLY`` config key is set, requests to
+        endpoints not registered with ``page`` or ``add_shorthand_route`` are
+        ignored.
         """
-        # request is ajax
-        if request.headers.get("X-Requested-With") != "XMLHttpRequest":
+        if current_app.config.get("INERTIA_REGISTERED_PAGES_ONLY") and not hasattr(
+            current_app.view_functions.get(request.endpoint), "inertia_page"
+        ):
             return None
 
-        # check if send with Inertia
-        if not request.headers.get("X-Inertia"):
-            raise BadRequest("Inertia headers not found")
+        if not is_inertia_xhr(request.headers):
+            return None
 
         # check inertia version
         server_version = get_asset_version()
-        inertia_version = request.headers.get("X-Inertia-Version")
-        if (
-            request.method == "GET"
-            and inertia_version
-            and inertia_version != server_version
-        ):
+        if is_stale_version(request.method, request.headers, server_version):
             response = Response(
                 "Inertia versions does not match", status=HTTPStatus.CONFLICT
             )
             response.headers["X-Inertia-Location"] = request.full_path
             return response
 
+        cache = self._get_prefetch_cache()
+        if cache is not None and request.method == "GET" and not _is_prefetch():
+            key = _prefetch_cache_key(server_version)
+            cached_response = None if key is None else cache.pop(key)
+            if cached_response is not None:
+                return thaw_response(cached_response)
+
         return None
 
+    def cache_prefetch_response(self, response: Response) -> Response:
+        """Store the responses of Inertia prefetch requests.
+
+        Inertia clients prefetch pages (i.e. when hovering a link) using requests
+        with a ``Purpose: prefetch`` header. When the ``INERTIA_PREFETCH_CACHE_TTL``
+        config key is set, their responses are kept in a per-user size-bounded cache
+        for this number of seconds so that the visit following it is not computed
+        twice. Users are identified by the request cookies and authorization
+        header, requests without any are not cached.
+
+        :param response: The generated response to store
+        """
+        cache = self._get_prefetch_cache()
+        if (
+            cache is not None
+            and request.method == "GET"
+            and request.headers.get("X-Inertia")
+            and _is_prefetch()
+            and response.status_code == HTTPStatus.OK
+            and not response.is_streamed
+        ):
+            key = _prefetch_cache_key(get_asset_version())
+            if key is not None:
+                cache.set(key, freeze_response(response, drop_cookies=True))
+
+        return response
+
+    def _get_prefetch_cache(self) -> Optional[TTLCache]:
+        ttl = current_app.config.get("INERTIA_PREFETCH_CACHE_TTL")
+        if not ttl:
+            return None
+
+        if self._prefetch_cache is None:
+            self._prefetch_cache = TTLCache(
+                current_app.config.get("INERTIA_PREFETCH_CACHE_SIZE", 128), ttl
+            )
+
+        return self._prefetch_cache
+
+    def _current_app(self) -> Flask:
+        return current_app
+
+    def _request_globals(self) -> Optional[Any]:
+        return g if has_request_context() else None
+
+    def _call_in_app_context(self, func: Callable) -> Any:
+        with self.app.app_context():
+            return func()
+
     def update_redirect(self, response: Response) -> Response:
         """Update redirect to set 303 status code.
 
@@ -113,26 +261,203 @@ class Inertia:
 
         :param response: The generated response to update
         """
-        if (
-            request.method in ["PUT", "PATCH", "DELETE"]
-            and response.status_code == HTTPStatus.FOUND  # 302
-        ):
-            response.status_code = HTTPStatus.SEE_OTHER  # 303
-
+        response.status_code = redirect_status(request.method, response.status_code)
         return response
 
-    def share(self, key: str, value: Any):
-        """Preassign shared data for each request.
+    def page(
+        self,
+        component_name: str,
+        cache: Union[bool, Dict[str, Any]] = False,
+        deferred: Iterable[str] = (),
+    ) -> Callable:
+        """Register a view rendering an Inertia component.
+
+        The decorated view returns the component props, other return values (i.e.
+        redirections) are sent as is. The page options are resolved once, when the
+        view is registered.
+
+        .. code-block:: python
+
+           @app.route("/users/")
+           @inertia.page("Users", cache={"ttl": 60}, deferred=["stats"])
+           def users():
+               return {"users": get_users, "stats": get_stats}
+
+        :param component_name: Your frontend component name
+        :param cache: Cache the view responses, ``True`` or the ``cache_page``
+                      arguments
+        :param deferred: Keys of the props loaded by the client once the page is
+                         rendered (see ``defer_include``)
+        """
+        deferred = tuple(deferred)
+
+        def decorator(view: Callable) -> Callable:
+            @functools.wraps(view)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                from flask_inertia.views import render_inertia
+
+                rv = view(*args, **kwargs)
+                if not isinstance(rv, dict):
+                    return rv
+
+                for key in deferred:
+                    if key in rv and not isinstance(rv[key], DeferredProp):
+                        value = rv[key]
+                        rv[key] = DeferredProp(
+                            value if callable(value) else lambda value=value: value
+                        )
+
+                return render_inertia(component_name, rv)
+
+            if cache:
+                wrapper = self.cache_page(**({} if cache is True else cache))(
+                    wrapper
+                )
+
+            wrapper.inertia_page = RegisteredPage(component_name, cache, deferred)
+            self.pages[component_name] = wrapper.inertia_page
+            return wrapper
+
+        return decorator
+
+    def cache_page(
+        self,
+        ttl: Optional[float] = None,
+        key: Optional[Callable[[], Hashable]] = None,
+        tags: Iterable[str] = (),
+        vary: Iterable[str] = (),
+        bypass: Optional[Callable[[], bool]] = None,
+    ) -> Callable:
+        """Cache the responses of an Inertia view for anonymous visitors.
+
+        HTML and JSON responses are cached per URL (or custom key), response type,
+        partial reload, asset version, shared data revision and ``vary`` headers
+        values. The cache is bypassed for non GET requests, when data is shared for
+        the current request and, by default, when the visitor has a session or sends
+        an ``Authorization`` header. Responses are not stored if the view read or
+        wrote the session (i.e. to create a CSRF token), or if they set or vary on
+        cookies.
+
+        .. code-block:: python
+
+           @app.route("/products/")
+           @inertia.cache_page(ttl=300, tags=["products"])
+           def products():
+               return render_inertia("Products", props={"products": get_products})
+
+           inertia.page_cache.invalidate("products")
+
+        :param ttl: Time to live of the cached responses in seconds (by default the
+                    ``INERTIA_PAGE_CACHE_TTL`` config value)
+        :param key: Callable returning the cache key used instead of the URL
+        :param tags: Tags used to invalidate the cached responses
+        :param vary: Names of the request headers the responses depend on
+        :param bypass: Callable returning ``True`` when the cache must not be used
+        """
+        bypass = bypass or _is_authenticated
+        tags, vary = tuple(tags), tuple(vary)
+
+        def decorator(view: Callable) -> Callable:
+            @functools.wraps(view)
+            def wrapper(*args: Any, **kwargs: Any) -> Response:
+                if (
+                    request.method not in ("GET", "HEAD")
+                    or g.get("_inertia_shared")
+                    or bypass()
+                ):
+                    return view(*args, **kwargs)
+
+                cache_key = (
+                    key() if key is not None else request.url,
+                    request.endpoint,
+                    bool(request.headers.get("X-Inertia")),
+                    negotiate_msgpack(request.accept_mimetypes),
+                    request.headers.get("X-Inertia-Partial-Component"),
+                    tuple(request.headers.getlist("X-Inertia-Partial-Data")),
+                    get_asset_version(),
+                    self._shared_revision,
+                    tuple(request.headers.get(header) for header in vary),
+                )
+                frozen = self.page_cache.get(cache_key)
+                if frozen is None:
+                    accessed = session.accessed
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != HTTPStatus.OK or not _is_shareable(
+                        response, accessed
+                    ):
+                        return response
+
+                    frozen = freeze_response(response)
+                    self.page_cache.set(cache_key, frozen, ttl=ttl, tags=tags)
+
+                return thaw_response(frozen)
+
+            return wrapper
+
+        return decorator
+
+    def live_source(self, channel: str, key: str) -> Callable:
+        """Register a prop source for a live channel.
+
+        Sources are evaluated by ``refresh`` and their values pushed to the clients
+        subscribed to the channel.
+
+        .. code-block:: python
+
+           @inertia.live_source("dashboard", "visits")
+           def visits():
+               return Visit.query.count()
+
+        :param channel: The live channel name
+        :param key: The prop name
+        """
+
+        def decorator(source: Callable) -> Callable:
+            self._live_sources[channel][key] = source
+            return source
+
+        return decorator
+
+    def publish(self, channel: str, props: Dict[str, Any]):
+        """Push props values to the clients subscribed to a live channel.
+
+        :param channel: The live channel name
+        :param props: The props values to push
+        """
+        self.broker.publish(channel, props)
+
+    def refresh(self, channel: str):
+        """Evaluate the sources of a live channel and publish the changed values.
+
+        Must be called within an application context.
+
+        :param channel: The live channel name
+        """
+        last_values = self._live_values[channel]
+        changed = {}
+        for key, source in self._live_sources[channel].items():
+            value = source()
+            encoded = snapshot(value)
+            if last_values.get(key) != encoded:
+                last_values[key] = encoded
+                changed[key] = value
+
+        if changed:
+            self.publish(channel, changed)
+
+    def live_stream(self, channel: str) -> Response:
+        """Live channel endpoint streaming props updates as Server-Sent Events.
+
+        :param channel: The live channel name
+        """
+        return live_stream(self.broker, channel)
 
-        Sometimes you need to access certain data on numerous pages within your
-        application. For example, a common use-case for this is showing the
-        current user in the site header. Passing this data manually in each
-        response isn't practical. In these situations shared data can be useful.
+    def batch_reload(self) -> Response:
+        """Batch endpoint serving several partial reloads in a single request.
 
-        :param key: Data key to share between requests
-        :param value: Data value or Function returning the data value
+        See :func:`flask_inertia.batch.batch_reload`.
         """
-        self._shared_data[key] = value
+        return batch_reload()
 
     @staticmethod
     def context_processor():
@@ -150,28 +475,28 @@ class Inertia:
             "inertia": current_app.extensions["inertia"],
         }
 
-    def include_router(self) -> Markup:
-        """Include JS router in Templates."""
-        router_file = os.path.join(
-            os.path.abspath(os.path.dirname(__file__)), "router.js"
-        )
-        routes = {
-            rule.endpoint: rule.rule for rule in current_app.url_map.iter_rules()
-        }
-        with open(router_file, "r") as jsfile:
-            template = Template(jsfile.read())
-            # Jinja2 template automatically get rid of ['<'|'>'] chars
-            content = (
-                template.render(routes=routes)
-                .replace("\\u003c", "<")
-                .replace("\\u003e", ">")
-            )
-            content_minified = jsmin(content)
+    def warm_up(self, app: Optional[Flask] = None):
+        """Precompute the asset version and the router script.
+
+        Call it once all your routes are registered, i.e. at the end of your
+        application factory. When the application is preloaded by a preforking
+        server (like ``gunicorn --preload``), the workers share these values
+        instead of computing them on their first request.
 
-        return Markup(content_minified)
+        :param app: The Flask application (by default the one given to ``init_app``)
+        """
+        app = app or self.app
+        with app.app_context():
+            if app.config.get("INERTIA_TEMPLATE") is not None:
+                get_asset_version()
+            self.include_router()
 
     def add_shorthand_route(
-        self, url: str, component_name: str, endpoint: Optional[str] = None
+        self,
+        url: str,
+        component_name: str,
+        endpoint: Optional[str] = None,
+        cache: bool = False,
     ) -> None:
         """Connect a URL rule to a frontend component that does not need a controller.
 
@@ -182,12 +507,118 @@ class Inertia:
         :param component_name: Your frontend component name
         :param endpoint: The endpoint for the registered URL rule. (by default
                          ``component_name`` in lower case)
+        :param cache: Cache the rendered HTML and JSON responses while the shared
+                      data is static
         """
         if not self.app:
             raise RuntimeError("Extension has not been initialized correctly.")
 
+        from flask_inertia.views import render_inertia
+
+        def shorthand_view() -> Response:
+            if cache:
+                return self._render_cached_shorthand(component_name)
+            return render_inertia(component_name)
+
+        shorthand_view.inertia_page = RegisteredPage(component_name, cache, ())
+        self.pages[component_name] = shorthand_view.inertia_page
+
         self.app.add_url_rule(
-            url,
-            endpoint or component_name.lower(),
-            lambda: render_inertia(component_name),
+            url, endpoint or component_name.lower(), shorthand_view
         )
+
+    def _render_cached_shorthand(self, component_name: str) -> Response:
+        """Render a shorthand route component, reusing a previously rendered response.
+
+        Responses are cached per URL, response type and format, asset version and
+        shared data revision. They are not cached if a shared data value is a callable or if
+        data is shared for the current request. Like ``cache_page``, visitors with
+        a session or an ``Authorization`` header bypass the cache, since the
+        template may render per-user data (i.e. a CSRF token). Renders using the
+        session or setting cookies are not cached either.
+
+        :param component_name: Your frontend component name
+        """
+        from flask_inertia.views import render_inertia
+
+        if (
+            request.headers.get("X-Inertia-Partial-Data")
+            or _is_authenticated()
+            or g.get("_inertia_shared")
+            or any(callable(value) for value in self._shared_data.values())
+        ):
+            return render_inertia(component_name)
+
+        key = (
+            request.url,
+            bool(request.headers.get("X-Inertia")),
+            get_asset_version(),
+            self._shared_revision,
+            negotiate_msgpack(request.accept_mimetypes),
+        )
+        frozen = self._shorthand_cache.get(key)
+        if frozen is None:
+            accessed = session.accessed
+            response = current_app.make_response(
+                render_inertia(component_name, stream=False)
+            )
+            if not _is_shareable(response, accessed):
+                return response
+
+            frozen = freeze_response(response)
+            self._shorthand_cache.set(key, frozen)
+
+        return thaw_response(frozen)
+
+
+def _is_authenticated() -> bool:
+    """Check if the current request comes from a visitor with a session."""
+    return bool(session) or "Authorization" in request.headers
+
+
+def _is_shareable(response: Response, accessed: bool) -> bool:
+    """Check if a response rendered for an anonymous visitor can be served to others.
+
+    The render must not have used the session (i.e. to create a CSRF token), and
+    the response must not set cookies nor vary on them.
+
+    :param response: The rendered response
+    :param accessed: Whether the session was accessed before the render
+    """
+    return (
+        not session.modified
+        and session.accessed == accessed
+        and "Set-Cookie" not in response.headers
+        and "cookie" not in response.vary
+    )
+
+
+def _is_prefetch() -> bool:
+    """Check if the current request is a prefetch request."""
+    return "prefetch" in (
+        request.headers.get("Purpose", ""),
+        request.headers.get("Sec-Purpose", ""),
+    )
+
+
+def _prefetch_cache_key(version: str) -> Optional[tuple]:
+    """Build the prefetch cache key of the current request.
+
+    Responses are stored per user, identified by all the request cookies and the
+    authorization header. Returns ``None`` for requests without cookies nor
+    authorization, which are not cached.
+
+    :param version: The current asset version
+    """
+    identity = (request.headers.get("Cookie"), request.headers.get("Authorization"))
+    if identity == (None, None):
+        return None
+
+    return (
+        identity,
+        request.full_path,
+        version,
+        request.headers.get("X-Inertia-Partial-Component"),
+        tuple(request.headers.getlist("X-Inertia-Partial-Data")),
+        negotiate_msgpack(request.accept_mimetypes),
+    )
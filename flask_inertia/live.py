@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.live
+------------------
+
+Push props updates to Inertia clients using Server-Sent Events.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from flask import Response, current_app, stream_with_context
+
+
+class Subscription:
+    """A client subscription to a live channel.
+
+    Published props are merged until they are consumed, so a slow client only
+    receives the latest value of each prop.
+
+    :param broker: The broker the subscription belongs to
+    :param channel: The subscribed channel name
+    """
+
+    def __init__(self, broker: "Broker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self._pending: Dict[str, Any] = {}
+        self._condition = threading.Condition()
+
+    def put(self, props: Dict[str, Any]):
+        """Queue props values for the subscriber.
+
+        :param props: The published props values
+        """
+        with self._condition:
+            self._pending.update(props)
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for published props values.
+
+        Returns an empty dict if nothing has been published before ``timeout``.
+
+        :param timeout: Maximum time to wait in seconds
+        """
+        with self._condition:
+            if not self._pending:
+                self._condition.wait(timeout)
+            props, self._pending = self._pending, {}
+
+        return props
+
+    def close(self):
+        """Unsubscribe from the channel."""
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """Publish/subscribe backend interface used by the live channels.
+
+    Subclass it to dispatch props updates between processes (i.e. using Redis
+    pub/sub), publishing to the local subscriptions when a message is received.
+    """
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to a channel.
+
+        :param channel: The channel name
+        """
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription.
+
+        :param subscription: The subscription to remove
+        """
+        raise NotImplementedError
+
+    def publish(self, channel: str, props: Dict[str, Any]):
+        """Publish props values to every subscriber of a channel.
+
+        :param channel: The channel name
+        :param props: The props values
+        """
+        raise NotImplementedError
+
+
+class LocalBroker(Broker):
+    """In-process broker, only dispatching updates to clients of the same process."""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to a channel.
+
+        :param channel: The channel name
+        """
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription.
+
+        :param subscription: The subscription to remove
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel: str, props: Dict[str, Any]):
+        """Publish props values to every subscriber of a channel.
+
+        :param channel: The channel name
+        :param props: The props values
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(props)
+
+
+def snapshot(value: Any) -> str:
+    """Encode a prop value as compact JSON, compared to detect its changes.
+
+    Comparing encoded snapshots rather than the values themselves detects the
+    changes of lists and dicts mutated in place.
+
+    :param value: The prop value
+    """
+    serializers = current_app.extensions["inertia"].serializers
+    return current_app.json.dumps(
+        value, default=serializers.default, separators=(",", ":")
+    )
+
+
+def live_stream(broker: Broker, channel: str) -> Response:
+    """Stream the props published on a channel as Server-Sent Events.
+
+    Each ``props`` event only contains the props whose values changed since the
+    last event sent to the client. A comment is sent every ``INERTIA_LIVE_HEARTBEAT``
+    seconds (15 by default) to keep the connection alive.
+
+    :param broker: The broker used to subscribe to the channel
+    :param channel: The channel name
+    """
+    heartbeat = current_app.config.get("INERTIA_LIVE_HEARTBEAT", 15)
+    subscription = broker.subscribe(channel)
+
+    def generate():
+        sent = {}
+        yield ": connected\n\n"
+        while True:
+            props = subscription.get(timeout=heartbeat)
+            encoded = {key: snapshot(value) for key, value in props.items()}
+            changed = {
+                key: value
+                for key, value in encoded.items()
+                if sent.get(key) != value
+            }
+            if not changed:
+                if not props:
+                    yield ": heartbeat\n\n"
+                continue
+
+            sent.update(changed)
+            data = ",".join(
+                f"{json.dumps(key)}:{value}"
+                for key, value in sorted(changed.items())
+            )
+            yield f"event: props\ndata: {{{data}}}\n\n"
+
+    response = current_app.response_class(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(subscription.close)
+    return response
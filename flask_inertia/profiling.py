@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.profiling
+-----------------------
+
+Profile a sample of Inertia renders and report the slow ones.
+
+One render out of ``INERTIA_PROFILE_SAMPLE_RATE`` is profiled with cProfile,
+and with tracemalloc if ``INERTIA_PROFILE_MEMORY`` is set. Renders slower than
+``INERTIA_PROFILE_THRESHOLD`` seconds are sent to the extension
+``profile_sink``, logging them or writing them to the ``INERTIA_PROFILE_DIR``
+directory.
+"""
+
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from flask import Response, current_app, g, request
+
+# a single render is profiled at a time, profilers and tracemalloc are global
+_lock = threading.Lock()
+
+
+class PropProfile(NamedTuple):
+    """Resources used to evaluate a prop."""
+
+    duration: float
+    cpu_time: float
+    allocated: Optional[int]
+
+
+class RenderProfile(NamedTuple):
+    """Profile of an Inertia render."""
+
+    component: str
+    url: str
+    duration: float
+    props: Dict[str, PropProfile]
+    stats: pstats.Stats
+    snapshot: Optional[tracemalloc.Snapshot]
+
+
+class RenderProfiler:
+    """Profile a render and the evaluation of its props.
+
+    :param trace_memory: Trace memory allocations with tracemalloc
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.props: Dict[str, PropProfile] = {}
+        self.duration = 0.0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self._profile = cProfile.Profile()
+        self._started_tracing = False
+        self._start = 0.0
+
+    def start(self) -> bool:
+        """Start profiling, return ``False`` if another render is being profiled."""
+        if not _lock.acquire(blocking=False):
+            return False
+
+        try:
+            self._profile.enable()
+        except ValueError:
+            # another profiler is active
+            _lock.release()
+            return False
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        self._start = time.perf_counter()
+        return True
+
+    def stop(self):
+        """Stop profiling."""
+        self.duration = time.perf_counter() - self._start
+        self._profile.disable()
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+        _lock.release()
+
+    @contextmanager
+    def prop(self, key: str) -> Iterator[None]:
+        """Attribute the resources used in the block to a prop.
+
+        :param key: The prop key
+        """
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.props[key] = PropProfile(
+                time.perf_counter() - start,
+                time.thread_time() - cpu_start,
+                tracemalloc.get_traced_memory()[0] - memory if tracing else None,
+            )
+
+    def get_profile(self, component_name: str, url: str) -> RenderProfile:
+        """Return the profile of the render.
+
+        :param component_name: The rendered component name
+        :param url: The page URL
+        """
+        return RenderProfile(
+            component_name,
+            url,
+            self.duration,
+            self.props,
+            pstats.Stats(self._profile),
+            self.snapshot,
+        )
+
+
+def start_render_profile() -> Optional[RenderProfiler]:
+    """Start profiling the current render if it is sampled."""
+    rate = current_app.config.get("INERTIA_PROFILE_SAMPLE_RATE")
+    if not rate or random.randrange(rate):
+        return None
+
+    profiler = RenderProfiler(
+        current_app.config.get("INERTIA_PROFILE_MEMORY", False)
+    )
+    return profiler if profiler.start() else None
+
+
+def finish_render_profile(profiler: RenderProfiler, component_name: str):
+    """Stop profiling the current render and report it if it is slow.
+
+    :param profiler: The render profiler
+    :param component_name: The rendered component name
+    """
+    profiler.stop()
+    if profiler.duration >= current_app.config.get("INERTIA_PROFILE_THRESHOLD", 1.0):
+        profile = profiler.get_profile(component_name, request.url)
+        extension = current_app.extensions["inertia"]
+        if extension.profile_sink is None:
+            extension.profile_sink = default_sink(current_app)
+        extension.profile_sink(profile)
+
+
+def profile_render(render: Callable[..., Response]) -> Callable[..., Response]:
+    """Decorate a render function to profile a sample of its calls.
+
+    The profiler is available as ``g._inertia_profiler`` during the render, to
+    attribute resources to props.
+
+    :param render: The render function, taking the component name first
+    """
+
+    @functools.wraps(render)
+    def wrapper(component_name: str, *args: Any, **kwargs: Any) -> Response:
+        profiler = start_render_profile()
+        if profiler is None:
+            return render(component_name, *args, **kwargs)
+
+        g._inertia_profiler = profiler
+        try:
+            return render(component_name, *args, **kwargs)
+        finally:
+            g.pop("_inertia_profiler", None)
+            finish_render_profile(profiler, component_name)
+
+    return wrapper
+
+
+def _format_props(profile: RenderProfile) -> List[str]:
+    lines = []
+    for key, prop in sorted(
+        profile.props.items(), key=lambda item: item[1].duration, reverse=True
+    ):
+        line = f"{key}: {prop.duration:.4f}s wall, {prop.cpu_time:.4f}s cpu"
+        if prop.allocated is not None:
+            line += f", {prop.allocated} bytes"
+        lines.append(line)
+
+    return lines
+
+
+class LogSink:
+    """Log slow renders profiles.
+
+    :param logger: The logger, the application logger by default
+    :param limit: Number of functions and allocation sites reported
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, limit: int = 20):
+        self.logger = logger
+        self.limit = limit
+
+    def __call__(self, profile: RenderProfile):
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.add(profile.stats)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.limit)
+        lines = [
+            f"Slow Inertia render of {profile.component} ({profile.url}) "
+            f"in {profile.duration:.3f}s",
+            *_format_props(profile),
+            stream.getvalue(),
+        ]
+        if profile.snapshot is not None:
+            lines.extend(
+                str(stat)
+                for stat in profile.snapshot.statistics("lineno")[: self.limit]
+            )
+
+        logger = self.logger or current_app.logger
+        logger.warning("\n".join(lines))
+
+
+class DirectorySink:
+    """Write slow renders profiles to a directory, keeping the most recent ones.
+
+    For each render, ``<name>.prof`` contains the cProfile stats (readable with
+    ``pstats`` or snakeviz), ``<name>.json`` the per-prop breakdown and
+    ``<name>.tracemalloc`` the memory snapshot if memory is traced.
+
+    :param directory: The profiles directory, created if needed
+    :param keep: Number of profiles kept
+    """
+
+    def __init__(self, directory: str, keep: int = 50):
+        self.directory = directory
+        self.keep = keep
+
+    def __call__(self, profile: RenderProfile):
+        os.makedirs(self.directory, exist_ok=True)
+        component = re.sub(r"[^\w-]", "_", profile.component)
+        name = f"{time.time():.6f}-{component}"
+        path = os.path.join(self.directory, name)
+        profile.stats.dump_stats(f"{path}.prof")
+        if profile.snapshot is not None:
+            profile.snapshot.dump(f"{path}.tracemalloc")
+        with open(f"{path}.json", "w") as summary:
+            json.dump(
+                {
+                    "component": profile.component,
+                    "url": profile.url,
+                    "duration": profile.duration,
+                    "props": {
+                        key: prop._asdict() for key, prop in profile.props.items()
+                    },
+                },
+                summary,
+            )
+
+        self._rotate()
+
+    def _rotate(self):
+        names = sorted(
+            {
+                filename.rsplit(".", 1)[0]
+                for filename in os.listdir(self.directory)
+                if filename.endswith(".json")
+            },
+            key=lambda name: float(name.split("-", 1)[0]),
+        )
+        for name in names[: -self.keep]:
+            for extension in (".prof", ".json", ".tracemalloc"):
+                try:
+                    os.remove(os.path.join(self.directory, name + extension))
+                except FileNotFoundError:
+                    pass
+
+
+def default_sink(app: Any) -> Callable[[RenderProfile], None]:
+    """Return the sink writing profiles to ``INERTIA_PROFILE_DIR`` if set, logging them otherwise.
+
+    :param app: The Flask application
+    """
+    profile_dir = app.config.get("INERTIA_PROFILE_DIR")
+    return DirectorySink(profile_dir) if profile_dir else LogSink()
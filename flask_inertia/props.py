@@ -30,7 +30,41 @@ flask_inertia.props
 Wrappers to implement lazy data evaluation for Inertia partial reloads.
 """
 
-from typing import Any, Callable
+import hashlib
+import inspect
+import json
+import sys
+import threading
+import time
+from operator import attrgetter, itemgetter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import flask
+from flask import current_app
+
+
+def current_extension() -> Any:
+    """Return the Inertia extension of the current Flask or Quart application."""
+    if flask.has_app_context():
+        return current_app.extensions["inertia"]
+
+    quart = sys.modules.get("quart")
+    if quart is not None and quart.has_app_context():
+        return quart.current_app.extensions["inertia"]
+
+    raise RuntimeError("Working outside of application context.")
 
 
 class LazyProp:
@@ -43,6 +77,41 @@ class LazyProp:
         return self.callback()
 
 
+class DeferredProp(LazyProp):
+    """Wrapper to specify that a prop is loaded by the client once the page is rendered."""
+
+    def __init__(self, callback: Callable, group: str = "default"):
+        super().__init__(callback)
+        self.group = group
+
+
+class DeadlineProp:
+    """Wrapper to specify that a prop is replaced if not computed in time.
+
+    On timeout the prop is converted into a deferred prop of ``group`` if set, or
+    replaced by ``fallback``.
+    """
+
+    def __init__(
+        self,
+        callback: Callable,
+        timeout: Optional[float] = None,
+        fallback: Any = None,
+        group: Optional[str] = None,
+    ):
+        self.callback = callback
+        self.timeout = timeout
+        self.fallback = fallback
+        self.group = group
+
+    def __call__(self) -> Any:
+        return self.callback()
+
+    def get_fallback(self) -> Any:
+        """Return the value sent in place of the prop when it misses its deadline."""
+        return self.fallback() if callable(self.fallback) else self.fallback
+
+
 class AlwaysProp:
     """Wrapper to specify that a prop should always be included, even if it has not been explicitly required."""
 
@@ -51,3 +120,219 @@ class AlwaysProp:
 
     def __call__(self) -> Any:
         return self.value() if callable(self.value) else self.value
+
+
+_MISSING = object()
+
+
+class RevalidatingProp:
+    """Wrapper to specify that a prop is served from cache and refreshed in the background once stale.
+
+    The first evaluation computes the value. Afterwards the cached value is
+    returned immediately, once older than ``max_age`` it is still returned while
+    a refresh runs in the extension thread pool. The callback can be a coroutine
+    function with the Quart adapter.
+    """
+
+    def __init__(self, callback: Callable, max_age: float):
+        self.callback = callback
+        self.max_age = max_age
+        self._value: Any = _MISSING
+        self._expires = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Any:
+        with self._lock:
+            value = self._value
+            refresh = (
+                value is not _MISSING
+                and not self._refreshing
+                and time.monotonic() >= self._expires
+            )
+            if refresh:
+                self._refreshing = True
+
+        extension = current_extension()
+        if value is _MISSING:
+            return extension._flights.do(("revalidate", id(self)), self._load)
+
+        if refresh:
+            extension._get_executor().submit(self._refresh, extension)
+
+        return value
+
+    def _load(self) -> Any:
+        value = self.callback()
+        if inspect.isawaitable(value):
+            # coroutine functions (with Quart), the caller awaits the result
+            return self._store_awaited(value)
+
+        return self._store(value)
+
+    async def _store_awaited(self, awaitable: Awaitable) -> Any:
+        return self._store(await awaitable)
+
+    def _store(self, value: Any) -> Any:
+        with self._lock:
+            self._value = value
+            self._expires = time.monotonic() + self.max_age
+
+        return value
+
+    def _refresh(self, extension: Any):
+        try:
+            extension._call_in_app_context(self._load)
+            # cached pages include the shared data, they must not be reused
+            extension._shared_revision += 1
+        except Exception:
+            extension.app.logger.exception("Failed to refresh Inertia shared data")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+class DependentProp:
+    """Wrapper to specify that a prop is computed from other props or resources.
+
+    The callback receives the resolved dependencies as keyword arguments.
+    """
+
+    def __init__(self, callback: Callable, dependencies: Iterable[str]):
+        self.callback = callback
+        self.dependencies = tuple(dependencies)
+
+    def __call__(self, **dependencies: Any) -> Any:
+        return self.callback(**dependencies)
+
+
+class CoalescedProp:
+    """Wrapper to specify that concurrent evaluations of a prop share a single computation."""
+
+    def __init__(
+        self, key: Union[Hashable, Callable[[], Hashable]], callback: Callable
+    ):
+        self.key = key
+        self.callback = callback
+
+    def run(self, func: Callable[[], Any]) -> Any:
+        """Run ``func`` or wait for the in-flight computation sharing the prop key.
+
+        :param func: Callable computing the prop data
+        """
+        key = self.key() if callable(self.key) else self.key
+        return current_extension()._flights.do(key, func)
+
+    def __call__(self) -> Any:
+        return self.run(self.callback)
+
+
+TABLE_MARKER = "__inertia_table__"
+
+
+class TableProp:
+    """Wrapper to specify that a prop is a table encoded column by column.
+
+    Column names are encoded once and the values of each column as an array:
+
+    .. code-block:: json
+
+       {"__inertia_table__": 1, "columns": ["id", "name"], "data": [[1, 2], ["a", "b"]]}
+    """
+
+    def __init__(self, rows: Any, columns: Optional[Iterable[str]] = None):
+        self.rows = rows
+        self.columns = None if columns is None else tuple(columns)
+
+    def __call__(self) -> Dict[str, Any]:
+        rows = self.rows() if callable(self.rows) else self.rows
+        if hasattr(rows, "keys") or getattr(
+            getattr(rows, "dtype", None), "names", None
+        ):
+            columns, data = self._from_columns(rows)
+        else:
+            columns, data = self._from_rows(list(rows))
+
+        return {TABLE_MARKER: 1, "columns": list(columns), "data": data}
+
+    def _from_columns(self, table: Any) -> Tuple[Tuple[str, ...], List[List[Any]]]:
+        """Extract the columns of a column-oriented table.
+
+        Mappings of sequences, pandas data frames and NumPy structured arrays are
+        supported, arrays are converted with their ``tolist`` method.
+        """
+        columns = self.columns
+        if columns is None:
+            columns = tuple(
+                table.keys() if hasattr(table, "keys") else table.dtype.names
+            )
+
+        return columns, [_to_list(table[column]) for column in columns]
+
+    def _from_rows(self, rows: List[Any]) -> Tuple[Tuple[str, ...], List[List[Any]]]:
+        """Transpose a list of mappings or objects into columns."""
+        columns = self.columns
+        if columns is None:
+            if rows and not isinstance(rows[0], Mapping):
+                raise ValueError("Table ``columns`` are required for object rows.")
+
+            columns = tuple(rows[0]) if rows else ()
+
+        if not columns:
+            return columns, []
+
+        if not rows:
+            return columns, [[] for _ in columns]
+
+        if isinstance(rows[0], Mapping):
+            getter = itemgetter(*columns)
+        else:
+            getter = attrgetter(*columns)
+
+        if len(columns) == 1:
+            return columns, [[getter(row) for row in rows]]
+
+        return columns, [list(values) for values in zip(*map(getter, rows))]
+
+
+def _to_list(values: Any) -> List[Any]:
+    """Convert a column into a list, using ``tolist`` for array-backed columns."""
+    tolist = getattr(values, "tolist", None)
+    return tolist() if tolist is not None else list(values)
+
+
+class RawJSON:
+    """Validated JSON text spliced verbatim into the encoded page object."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class RawJSONProp:
+    """Wrapper to specify that a prop is already serialized as JSON."""
+
+    def __init__(self, data: Union[bytes, str, Callable[[], Union[bytes, str]]]):
+        self.data = data
+
+    def __call__(self) -> Any:
+        data = self.data() if callable(self.data) else self.data
+        if isinstance(data, str):
+            text, data = data, data.encode("utf-8")
+        else:
+            text = data.decode("utf-8")
+
+        extension = current_extension()
+        if not extension._json_extended:
+            # the application JSON provider can not splice the fragment
+            return json.loads(text)
+
+        # parsing is much slower than hashing, a fragment is only parsed once
+        validated = extension._validated_json
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if validated.get(digest) is None:
+            json.loads(text)
+            validated.set(digest, True)
+
+        return RawJSON(text)
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.quart
+-------------------
+
+Inertia adapter for Quart, the ASGI implementation of the Flask API.
+
+The adapter shares the protocol implementation, the state and the props wrappers
+of the Flask extension (see :class:`~flask_inertia.core.InertiaBase`). Props are
+resolved with native ``await``:
+
+.. code-block:: python
+
+   from quart import Quart
+   from flask_inertia import lazy_include
+   from flask_inertia.quart import QuartInertia, render_inertia
+
+   app = Quart(__name__)
+   inertia = QuartInertia(app)
+
+   async def get_users():
+       ...
+
+   @app.route("/")
+   async def index():
+       return await render_inertia(
+           "Index", props={"users": get_users, "stats": lazy_include(get_stats)}
+       )
+"""
+
+import asyncio
+import inspect
+import time
+from collections import ChainMap
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Union
+
+from quart import (
+    Quart,
+    Response,
+    abort,
+    current_app,
+    g,
+    has_request_context,
+    jsonify,
+    render_template,
+    request,
+    stream_template,
+)
+
+from flask_inertia.core import (
+    InertiaBase,
+    build_page,
+    defer_prop,
+    get_partial_keys,
+    is_inertia_xhr,
+    is_stale_version,
+    redirect_status,
+    select_props,
+)
+from flask_inertia.encoding import Page, dumps_msgpack, negotiate_msgpack
+from flask_inertia.resolver import AsyncPropResolver, DeadlineExceeded
+from flask_inertia.signals import prop_deadline_missed
+
+
+class QuartInertia(InertiaBase):
+    """Inertia Plugin for Quart."""
+
+    def __init__(self, app: Optional[Quart] = None):
+        super().__init__()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Quart):
+        """Init as an app extension.
+
+        * Register before_request hook
+        * Register after_request hook
+        * Set context processor to have an `inertia` value in templates
+        * Extend the application JSON provider to encode pages with the extension
+          serializers
+        * Load the build artifacts if ``INERTIA_BUILD_DIR`` is set
+
+        :param app: The Quart application
+        """
+        super().init_app(app)
+        app.extensions["inertia"] = self
+        app.context_processor(self.context_processor)
+        app.before_request(self.process_incoming_inertia_requests)
+        app.after_request(self.update_redirect)
+
+    def _current_app(self) -> Quart:
+        return current_app
+
+    def _request_globals(self) -> Optional[Any]:
+        return g if has_request_context() else None
+
+    def _call_in_app_context(self, func: Callable) -> Any:
+        async def call() -> Any:
+            async with self.app.app_context():
+                value = func()
+                return await value if inspect.isawaitable(value) else value
+
+        return asyncio.run(call())
+
+    async def process_incoming_inertia_requests(self) -> Optional[Response]:
+        """Process incoming Inertia requests.
+
+        AJAX requests must be forged by Inertia. A GET request sent with an
+        outdated asset version gets a 409 Conflict response including the URL in
+        a X-Inertia-Location header.
+        """
+        if not is_inertia_xhr(request.headers):
+            return None
+
+        if is_stale_version(
+            request.method, request.headers, self.get_asset_version()
+        ):
+            response = Response(
+                "Inertia versions does not match", status=HTTPStatus.CONFLICT
+            )
+            response.headers["X-Inertia-Location"] = request.full_path
+            return response
+
+        return None
+
+    async def update_redirect(self, response: Response) -> Response:
+        """Update redirect to set 303 status code after PUT, PATCH and DELETE requests.
+
+        :param response: The generated response to update
+        """
+        response.status_code = redirect_status(request.method, response.status_code)
+        return response
+
+    def context_processor(self) -> Dict[str, Any]:
+        """Add an `inertia` directive to Jinja2 templates to allow router inclusion."""
+        return {"inertia": self}
+
+
+async def render_inertia(
+    component_name: str,
+    props: Dict[str, Any] = {},
+    view_data: Dict[str, Any] = {},
+    stream: Optional[bool] = None,
+    normalize: Optional[bool] = None,
+    timeout: Optional[float] = None,
+) -> Union[Response, str]:
+    """Coroutine to use instead of Quart `render_template`.
+
+    Works like :func:`flask_inertia.views.render_inertia`. Props callables may be
+    coroutine functions, props are resolved concurrently. Streamed HTML responses
+    are flushed as the template renders, once the props are resolved.
+
+    :param component_name: The component name used in your frontend framework
+    :param props: A dict of properties used in your component
+    :param view_data: A dict of data that will not be sent to your JavaScript component
+    :param stream: Stream the HTML response (by default the ``INERTIA_STREAM``
+                   config value)
+    :param normalize: Send the objects repeated in props once in the page ``refs``
+                      table (by default the ``INERTIA_NORMALIZE_REFS`` config value)
+    :param timeout: Time budget in seconds of the props declared with
+                    ``deadline_include`` (by default the ``INERTIA_RENDER_TIMEOUT``
+                    config value)
+    """
+    inertia_template = current_app.config.get("INERTIA_TEMPLATE")
+    if inertia_template is None:
+        abort(400, "No Inertia template found. Set INERTIA_TEMPLATE in config")
+
+    extension = current_app.extensions["inertia"]
+    partial_keys = get_partial_keys(request.headers, component_name)
+    page = build_page(
+        component_name,
+        request.url,
+        extension.get_asset_version(),
+        props,
+        partial_keys,
+    )
+    if timeout is None:
+        timeout = current_app.config.get("INERTIA_RENDER_TIMEOUT")
+
+    resolved_props = await _resolve_props(
+        select_props(partial_keys, props),
+        props,
+        page,
+        timeout,
+        allow_defer=partial_keys is None,
+    )
+    page = Page(page, props=resolved_props)
+    if normalize is None:
+        normalize = current_app.config.get("INERTIA_NORMALIZE_REFS", False)
+    page.normalize = normalize
+
+    if request.headers.get("X-Inertia", False):
+        msgpack_mimetype = negotiate_msgpack(request.accept_mimetypes)
+        if msgpack_mimetype is not None:
+            response = Response(
+                dumps_msgpack(page, extension.serializers), mimetype=msgpack_mimetype
+            )
+        else:
+            response = jsonify(page)
+        response.headers["X-Inertia"] = True
+        response.headers["Vary"] = "Accept"
+        return response
+
+    if stream is None:
+        stream = current_app.config.get("INERTIA_STREAM", False)
+
+    context = {"view_data": view_data, "page": page}
+    if stream:
+        return Response(
+            await stream_template(inertia_template, **context), mimetype="text/html"
+        )
+
+    return await render_template(inertia_template, **context)
+
+
+async def _resolve_props(
+    selected_props: Dict[str, Any],
+    props: Dict[str, Any],
+    page: Dict[str, Any],
+    timeout: Optional[float] = None,
+    allow_defer: bool = True,
+) -> Dict[str, Any]:
+    """Merge shared data into component props and evaluate them concurrently.
+
+    :param selected_props: The component props selected for the response
+    :param props: All the component props
+    :param page: The page object the props are sent with
+    :param timeout: Time budget of the props with a deadline
+    :param allow_defer: Convert props missing their deadline into deferred props
+    """
+    extension = current_app.extensions["inertia"]
+    shared_data = extension.get_shared_data()
+    resolver = AsyncPropResolver(
+        ChainMap(shared_data, props),
+        extension._resources,
+        g.setdefault("_inertia_resources", {}),
+        run_sync=current_app.ensure_async,
+        deadline=None if timeout is None else time.monotonic() + timeout,
+        allow_defer=allow_defer,
+    )
+    keys = list(ChainMap(shared_data, selected_props))
+    results = await asyncio.gather(
+        *(resolver.resolve(key) for key in keys), return_exceptions=True
+    )
+    resolved_props = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, DeadlineExceeded):
+            defer_prop(page, key, result.group)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            resolved_props[key] = result
+
+    for key, prop in resolver.missed.items():
+        prop_deadline_missed.send(
+            current_app._get_current_object(),
+            component=page["component"],
+            key=key,
+            deferred=prop.group is not None,
+        )
+
+    return resolved_props
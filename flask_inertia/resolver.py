@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.resolver
+----------------------
+
+Evaluate Inertia props, sharing intermediate results between them.
+"""
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Container,
+    Dict,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from flask_inertia.props import (
+    AlwaysProp,
+    CoalescedProp,
+    DeadlineProp,
+    DependentProp,
+    LazyProp,
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a prop misses its deadline.
+
+    Props with a fallback are replaced by the resolver, the error is only raised
+    by :meth:`PropResolver.resolve` for props deferred on timeout.
+
+    :param prop: The prop which missed its deadline
+    """
+
+    def __init__(self, prop: DeadlineProp):
+        super().__init__("Prop missed its deadline")
+        self.prop = prop
+        self.group = prop.group
+        self.key: Optional[str] = None
+
+
+class _BaseResolver:
+    """Lookup of props and resources shared by the synchronous and asynchronous resolvers."""
+
+    def __init__(
+        self,
+        props: Mapping[str, Any],
+        resources: Mapping[str, Callable],
+        resources_cache: MutableMapping[str, Any],
+        deadline: Optional[float] = None,
+        allow_defer: bool = True,
+    ):
+        self.props = props
+        self.resources = resources
+        self.resources_cache = resources_cache
+        self.deadline = deadline
+        self.allow_defer = allow_defer
+        self.missed: Dict[str, DeadlineProp] = {}
+        self._values: Dict[str, Any] = {}
+
+    def _lookup(
+        self, key: str, resolving: Container[Tuple[str, str]]
+    ) -> Tuple[Tuple[str, str], Any, MutableMapping[str, Any]]:
+        """Find the node, the value and the memo of a prop or a resource by its name.
+
+        :param key: The prop or resource name
+        :param resolving: The props and resources being resolved
+        """
+        if key in self.props and ("prop", key) not in resolving:
+            return ("prop", key), self.props[key], self._values
+
+        if key in self.resources:
+            return ("resource", key), self.resources[key], self.resources_cache
+
+        if key in self.props:
+            raise ValueError(f"Circular dependency found while resolving '{key}'")
+
+        raise KeyError(f"Unknown prop or resource '{key}'")
+
+    def _miss(self, key: str, exc: DeadlineExceeded, memo: MutableMapping[str, Any]):
+        """Replace a prop which missed its deadline by its fallback, or raise to defer it.
+
+        :param key: The prop or resource name
+        :param exc: The error raised while evaluating it
+        :param memo: The mapping memoizing its value
+        """
+        # the innermost resolved name is the one of the prop
+        if exc.key is not None:
+            raise exc
+
+        exc.key = key
+        self.missed[key] = exc.prop
+        if exc.group is not None:
+            raise exc
+
+        memo[key] = exc.prop.get_fallback()
+
+
+class PropResolver(_BaseResolver):
+    """Evaluate props and their dependencies at most once, in dependency order.
+
+    Dependencies are looked up in the props first, then in the resources, so a prop
+    can depend on a resource sharing its name. Props results are memoized for the
+    resolver lifetime while resources results are stored in the ``resources_cache``
+    mapping, which is usually request-scoped.
+
+    Props with a deadline are computed by ``submit`` and waited for until their
+    own timeout or the resolver ``deadline``. Missed props are replaced by their
+    fallback, or raise :class:`DeadlineExceeded` to be deferred, and are listed in
+    ``missed``.
+
+    :param props: All the props known for the response, sent or not
+    :param resources: Named resource factories
+    :param resources_cache: Mapping used to memoize resources results
+    :param submit: Callable running a callable in the background and returning its
+                   future, props with a deadline are computed inline without it
+    :param deadline: ``time.monotonic`` time after which the props with a deadline
+                     are not waited for anymore
+    :param allow_defer: Convert the props missing their deadline into deferred
+                        props, otherwise those props are waited for
+    """
+
+    def __init__(
+        self,
+        props: Mapping[str, Any],
+        resources: Mapping[str, Callable],
+        resources_cache: MutableMapping[str, Any],
+        submit: Optional[Callable[[Callable], Future]] = None,
+        deadline: Optional[float] = None,
+        allow_defer: bool = True,
+    ):
+        super().__init__(props, resources, resources_cache, deadline, allow_defer)
+        self.submit = submit
+        self._resolving: Set[Tuple[str, str]] = set()
+        self._futures: Dict[int, Tuple[Future, float]] = {}
+
+    def start(self, keys: Iterable[str]):
+        """Start computing the props with a deadline in the background.
+
+        Those props then run concurrently while the other props are evaluated.
+
+        :param keys: Names of the props to start
+        """
+        if self.submit is None:
+            return
+
+        for key in keys:
+            value = self.props.get(key)
+            if isinstance(value, DeadlineProp) and id(value) not in self._futures:
+                self._futures[id(value)] = (
+                    self.submit(value.callback),
+                    time.monotonic(),
+                )
+
+    def resolve(self, key: str) -> Any:
+        """Evaluate a prop or a resource by its name.
+
+        :param key: The prop or resource name
+        """
+        node, value, memo = self._lookup(key, self._resolving)
+        if key in memo:
+            return memo[key]
+
+        if node in self._resolving:
+            raise ValueError(f"Circular dependency found while resolving '{key}'")
+
+        self._resolving.add(node)
+        try:
+            memo[key] = self.evaluate(value)
+        except DeadlineExceeded as exc:
+            self._miss(key, exc, memo)
+        finally:
+            self._resolving.discard(node)
+
+        return memo[key]
+
+    def evaluate(self, value: Any) -> Any:
+        """Evaluate a prop value, resolving its dependencies first.
+
+        :param value: The prop value, a callable or a prop wrapper
+        """
+        if isinstance(value, AlwaysProp):
+            return self.evaluate(value.value)
+
+        if isinstance(value, LazyProp):
+            return self.evaluate(value.callback)
+
+        if isinstance(value, CoalescedProp):
+            return value.run(lambda: self.evaluate(value.callback))
+
+        if isinstance(value, DeadlineProp):
+            return self._wait(value)
+
+        if isinstance(value, DependentProp):
+            return value(**{name: self.resolve(name) for name in value.dependencies})
+
+        return value() if callable(value) else value
+
+    def _wait(self, prop: DeadlineProp) -> Any:
+        """Wait for a prop with a deadline, raising :class:`DeadlineExceeded` on timeout."""
+        defer = prop.group is not None
+        future, started = self._futures.pop(id(prop), (None, time.monotonic()))
+        deadline = self.deadline
+        if prop.timeout is not None:
+            prop_deadline = started + prop.timeout
+            deadline = (
+                prop_deadline if deadline is None else min(deadline, prop_deadline)
+            )
+
+        # a deferred prop explicitly requested by a partial reload is waited for
+        if deadline is None or (defer and not self.allow_defer):
+            return future.result() if future is not None else prop.callback()
+
+        if future is None:
+            if self.submit is None:
+                return prop.callback()
+            future = self.submit(prop.callback)
+
+        try:
+            return future.result(max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(prop) from None
+
+
+class AsyncPropResolver(_BaseResolver):
+    """Evaluate props and their dependencies with native ``await``.
+
+    Works like :class:`PropResolver` for asynchronous applications: callables
+    returning awaitables are awaited, and props and dependencies are evaluated
+    concurrently, each of them at most once. Props with a deadline are cancelled
+    once their deadline is reached, their synchronous callbacks are run with
+    ``run_sync`` so that they do not block the event loop. Coalesced props are
+    evaluated as regular props.
+
+    :param props: All the props known for the response, sent or not
+    :param resources: Named resource factories
+    :param resources_cache: Mapping used to memoize resources results
+    :param run_sync: Callable wrapping a synchronous callable into a coroutine
+                     function run outside of the event loop (i.e. Quart
+                     ``ensure_async``)
+    :param deadline: ``time.monotonic`` time after which the props with a deadline
+                     are not waited for anymore
+    :param allow_defer: Convert the props missing their deadline into deferred
+                        props, otherwise those props are waited for
+    """
+
+    def __init__(
+        self,
+        props: Mapping[str, Any],
+        resources: Mapping[str, Callable],
+        resources_cache: MutableMapping[str, Any],
+        run_sync: Optional[Callable[[Callable], Callable[[], Awaitable]]] = None,
+        deadline: Optional[float] = None,
+        allow_defer: bool = True,
+    ):
+        super().__init__(props, resources, resources_cache, deadline, allow_defer)
+        self.run_sync = run_sync
+        self._tasks: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+    async def resolve(self, key: str, path: Tuple[Tuple[str, str], ...] = ()) -> Any:
+        """Evaluate a prop or a resource by its name.
+
+        :param key: The prop or resource name
+        :param path: The props and resources being resolved depending on this one
+        """
+        node, value, memo = self._lookup(key, path)
+        if key in memo:
+            return memo[key]
+
+        if node in path:
+            raise ValueError(f"Circular dependency found while resolving '{key}'")
+
+        # concurrent dependents of a same node share its evaluation
+        task = self._tasks.get(node)
+        if task is None:
+            task = self._tasks[node] = asyncio.ensure_future(
+                self._resolve_node(key, value, memo, path + (node,))
+            )
+
+        return await task
+
+    async def _resolve_node(
+        self,
+        key: str,
+        value: Any,
+        memo: MutableMapping[str, Any],
+        path: Tuple[Tuple[str, str], ...],
+    ) -> Any:
+        try:
+            memo[key] = await self.evaluate(value, path)
+        except DeadlineExceeded as exc:
+            self._miss(key, exc, memo)
+
+        return memo[key]
+
+    async def evaluate(
+        self, value: Any, path: Tuple[Tuple[str, str], ...] = ()
+    ) -> Any:
+        """Evaluate a prop value, resolving its dependencies first.
+
+        :param value: The prop value, a callable or a prop wrapper
+        :param path: The props and resources being resolved depending on this value
+        """
+        if isinstance(value, AlwaysProp):
+            return await self.evaluate(value.value, path)
+
+        if isinstance(value, (LazyProp, CoalescedProp)):
+            return await self.evaluate(value.callback, path)
+
+        if isinstance(value, DeadlineProp):
+            return await self._wait(value)
+
+        if isinstance(value, DependentProp):
+            names = value.dependencies
+            values = await asyncio.gather(
+                *(self.resolve(name, path) for name in names)
+            )
+            return await _await(value(**dict(zip(names, values))))
+
+        return await _await(value()) if callable(value) else value
+
+    async def _wait(self, prop: DeadlineProp) -> Any:
+        """Wait for a prop with a deadline, raising :class:`DeadlineExceeded` on timeout."""
+        deadline = self.deadline
+        if prop.timeout is not None:
+            prop_deadline = time.monotonic() + prop.timeout
+            deadline = (
+                prop_deadline if deadline is None else min(deadline, prop_deadline)
+            )
+
+        if self.run_sync is not None and not asyncio.iscoroutinefunction(
+            prop.callback
+        ):
+            call = _await(self.run_sync(prop.callback)())
+        else:
+            call = _await(prop.callback())
+
+        # a deferred prop explicitly requested by a partial reload is waited for
+        if deadline is None or (prop.group is not None and not self.allow_defer):
+            return await call
+
+        try:
+            return await asyncio.wait_for(call, max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(prop) from None
+
+
+async def _await(value: Any) -> Any:
+    """Await a value if it is awaitable, possibly several times."""
+    while inspect.isawaitable(value):
+        value = await value
+
+    return value
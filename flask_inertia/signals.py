@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# MIT License
+#
+# Copyright (c) 2026 TROUVERIE Joachim <jtrouverie@joakode.fr>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+flask_inertia.signals
+---------------------
+
+Signals sent by the extension, to be used for instrumentation.
+
+.. code-block:: python
+
+   from flask_inertia.signals import prop_deadline_missed
+
+   @prop_deadline_missed.connect_via(app)
+   def count_timeout(sender, component, key, deferred, **extra):
+       statsd.incr(f"inertia.timeout.{component}.{key}")
+"""
+
+from flask.signals import Namespace
+
+_signals = Namespace()
+
+#: Sent when a prop misses its deadline, with the page ``component``, the prop
+#: ``key`` and whether the prop was ``deferred`` or replaced by its fallback.
+prop_deadline_missed = _signals.signal("inertia-prop-deadline-missed")
@@ -30,9 +30,67 @@ flask_inertia.unittest
 """
 
 import json
+from html.parser import HTMLParser
 from types import SimpleNamespace
+from typing import Any, Optional
 
 from flask import Response
+from flask.testing import FlaskClient
+
+from flask_inertia.encoding import MSGPACK_MIMETYPES, PAGE_ENVIRON_KEY
+
+
+class _PageFound(Exception):
+    pass
+
+
+class _PageExtractor(HTMLParser):
+    """HTML parser stopping at the root element to get its ``data-page``."""
+
+    def __init__(self, root_id: str):
+        super().__init__()
+        self.root_id = root_id
+
+    def handle_starttag(self, tag: str, attrs: list):
+        attrs = dict(attrs)
+        if attrs.get("id") == self.root_id:
+            raise _PageFound(attrs.get("data-page") or "{}")
+
+
+def extract_page(html: str, root_id: str) -> Optional[str]:
+    """Extract the JSON encoded page object from a HTML document.
+
+    The document is parsed with the standard library HTML parser until the root
+    element is found. Returns ``None`` if there is no element with this id.
+
+    :param html: The HTML document
+    :param root_id: Root component html id
+    """
+    parser = _PageExtractor(root_id)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _PageFound as found:
+        return found.args[0]
+
+    return None
+
+
+class InertiaTestClient(FlaskClient):
+    """Flask test client recording the Inertia pages encoded by the application.
+
+    The pages recorded while handling a request are read by
+    :meth:`InertiaTestResponse.inertia` without parsing the HTML response. Requests
+    opened with a WSGI environ or an environ builder are not recorded.
+    """
+
+    def open(self, *args: Any, **kwargs: Any) -> Response:
+        if not args or isinstance(args[0], str):
+            environ_base = dict(kwargs.get("environ_base") or {})
+            environ_base[PAGE_ENVIRON_KEY] = []
+            kwargs["environ_base"] = environ_base
+
+        return super().open(*args, **kwargs)
 
 
 class InertiaTestResponse(Response):
@@ -42,13 +100,14 @@ class InertiaTestResponse(Response):
 
     .. code-block:: python
 
-      from inertia.unittest import InertiaTestResponse
+      from inertia.unittest import InertiaTestClient, InertiaTestResponse
 
       class MyTestCase(unittest.TestCase):
 
           def setUp(self):
               self.app = create_app()  # if you use an application factory
               self.app.response_class = InertiaTestResponse
+              self.app.test_client_class = InertiaTestClient  # optional
               self.client = self.app.test_client()
 
           def test_lambda(self):
@@ -60,31 +119,31 @@ class InertiaTestResponse(Response):
     def inertia(self, root_id: str) -> SimpleNamespace:
         """Access inertia data stored in response.
 
-        Parse either the flask HTML response to extract the JSON encoded inertia
-        page object or the JSON response based on its headers.
+        Read the page object recorded while rendering the response when requested
+        with :class:`InertiaTestClient`. Otherwise parse either the flask HTML
+        response to extract the JSON encoded inertia page object or the JSON or
+        MessagePack response based on its headers.
 
         It will convert the page JSON object into a Python object using
         `SimpleNamespace`.
 
         :param root_id: Root component html id
         """
-        try:
-            from bs4 import BeautifulSoup
-
-            if not self.headers.get("X-Inertia", False):
-                soup = BeautifulSoup(self.data, features="html.parser")
-                root = soup.find(id=root_id)
-                data = root.get("data-page", "{}")
-            else:
-                data = self.data
-
-            return json.loads(data, object_hook=lambda d: SimpleNamespace(**d))
-        except ImportError as err:
-            err.msg = "\n".join(
-                [
-                    err.msg,
-                    "flask-inertia needs BeautifulSoup to parse html messages in tests, ",
-                    "please install it using `pip install flask-inertia[tests]`",
-                ]
+        request = getattr(self, "request", None)
+        pages = request.environ.get(PAGE_ENVIRON_KEY) if request else None
+        if pages:
+            data = pages[-1]
+        elif not self.headers.get("X-Inertia", False):
+            data = extract_page(self.get_data(as_text=True), root_id)
+            if data is None:
+                raise ValueError(f"No ``{root_id}`` element found in response.")
+        elif self.mimetype in MSGPACK_MIMETYPES:
+            import msgpack
+
+            return msgpack.unpackb(
+                self.data, object_hook=lambda d: SimpleNamespace(**d)
             )
-            raise err
+        else:
+            data = self.data
+
+        return json.loads(data, object_hook=lambda d: SimpleNamespace(**d))
@@ -30,20 +30,83 @@ flask_inertia.version
 Provide a method to calculate Flask assets version.
 """
 
-import hashlib
-import os
+from http import HTTPStatus
+from typing import Any, Callable, Iterable, Optional
 
-from flask import current_app
+from flask import Flask, Response, current_app
+from werkzeug.wrappers import Request
+
+from flask_inertia.core import get_template_path, hash_template
 
 
 def get_asset_version() -> str:
-    """Calculate asset version to allow Inertia to automatically make a full page visit in case of changes."""
-    template_path = os.path.join(
-        current_app.root_path,
-        current_app.template_folder,
-        current_app.config["INERTIA_TEMPLATE"],
-    )
-    with open(template_path, "rb") as template_file:
-        bytes_content = template_file.read()
-
-    return hashlib.sha256(bytes_content).hexdigest()
+    """Calculate asset version to allow Inertia to automatically make a full page visit in case of changes.
+
+    The version is read from the build artifacts if ``INERTIA_BUILD_DIR`` is set,
+    otherwise it is cached by the extension unless templates are auto reloaded
+    (i.e. in debug mode).
+    """
+    extension = current_app.extensions.get("inertia")
+    if extension is None:
+        return compute_asset_version()
+
+    return extension.get_asset_version()
+
+
+def compute_asset_version() -> str:
+    """Hash the Inertia template to calculate the asset version, bypassing caches."""
+    return hash_template(get_template_path(current_app))
+
+
+class VersionGate:
+    """WSGI middleware answering the Inertia requests of outdated clients.
+
+    Inertia GET requests whose ``X-Inertia-Version`` header does not match the
+    asset version get the 409 Conflict response with a ``X-Inertia-Location``
+    header before reaching the Flask application: no request context is pushed
+    and no URL is matched. The asset version is computed once, or on each Inertia
+    request if templates are auto reloaded (i.e. in debug mode). Other requests
+    are passed through.
+
+    It is installed by the extension if the ``INERTIA_VERSION_GATE`` config value
+    is set, or manually:
+
+    .. code-block:: python
+
+       app.wsgi_app = VersionGate(app.wsgi_app, app)
+
+    :param wsgi_app: The WSGI application to wrap
+    :param app: The Flask application computing the asset version
+    """
+
+    def __init__(self, wsgi_app: Callable, app: Flask):
+        self.wsgi_app = wsgi_app
+        self.app = app
+        self._version: Optional[str] = None
+
+    def get_version(self) -> str:
+        """Return the current asset version of the application."""
+        if self._version is None or self.app.jinja_env.auto_reload:
+            with self.app.app_context():
+                self._version = get_asset_version()
+
+        return self._version
+
+    def __call__(self, environ: dict, start_response: Callable) -> Iterable[Any]:
+        client_version = environ.get("HTTP_X_INERTIA_VERSION")
+        if (
+            client_version
+            and environ.get("REQUEST_METHOD") == "GET"
+            and environ.get("HTTP_X_INERTIA")
+            and environ.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest"
+            and client_version != self.get_version()
+        ):
+            response = Response(
+                "Inertia versions does not match", status=HTTPStatus.CONFLICT
+            )
+            response.headers["X-Inertia-Location"] = Request(
+                environ, shallow=True
+            ).full_path
+            return response(environ, start_response)
+
+        return self.wsgi_app(environ, start_response)
@@ -30,24 +30,80 @@ flask_inertia.views
 Implement a method to add Inertia rendering into Flask.
 """
 
+import contextvars
+import functools
+import time
+from collections import ChainMap
+from concurrent.futures import Future
+from contextlib import nullcontext
 from http import HTTPStatus
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Union
+
+from flask import (
+    Response,
+    abort,
+    current_app,
+    g,
+    jsonify,
+    render_template,
+    request,
+    stream_template,
+)
+
+from flask_inertia.core import build_page, defer_prop, get_partial_keys, select_props
+from flask_inertia.encoding import Page, dumps_msgpack, negotiate_msgpack
+from flask_inertia.props import (
+    AlwaysProp,
+    CoalescedProp,
+    DeadlineProp,
+    DeferredProp,
+    DependentProp,
+    LazyProp,
+    RawJSONProp,
+    TableProp,
+)
+from flask_inertia.resolver import DeadlineExceeded, PropResolver
+from flask_inertia.signals import prop_deadline_missed
+from flask_inertia.version import get_asset_version
 
-from flask import Response, abort, current_app, jsonify, render_template, request
 
-from flask_inertia.props import AlwaysProp, LazyProp
-from flask_inertia.version import get_asset_version
+def _profiled(render: Callable[..., Response]) -> Callable[..., Response]:
+    """Profile a sample of the renders if ``INERTIA_PROFILE_SAMPLE_RATE`` is set.
+
+    The profiling module is only imported once profiling is enabled, see
+    :func:`flask_inertia.profiling.profile_render`.
+
+    :param render: The render function, taking the component name first
+    """
+
+    @functools.wraps(render)
+    def wrapper(*args: Any, **kwargs: Any) -> Response:
+        if not current_app.config.get("INERTIA_PROFILE_SAMPLE_RATE"):
+            return render(*args, **kwargs)
 
+        from flask_inertia.profiling import profile_render
 
+        return profile_render(render)(*args, **kwargs)
+
+    return wrapper
+
+
+@_profiled
 def render_inertia(
     component_name: str,
     props: Dict[str, Any] = {},
     view_data: Dict[str, Any] = {},
+    stream: Optional[bool] = None,
+    normalize: Optional[bool] = None,
+    timeout: Optional[float] = None,
 ) -> Response:
     """Method to use instead of Flask `render_template`.
 
     Returns either a JSON response or a HTML response including a JSON encoded inertia
-    page object according to Inertia request headers.
+    page object according to Inertia request headers. Inertia requests preferring
+    ``application/x-msgpack`` in their ``Accept`` header get a MessagePack response
+    if the ``msgpack`` package is installed. A sample of the renders can be
+    profiled, see :mod:`flask_inertia.profiling`.
 
     .. code-block:: python
 
@@ -70,6 +126,15 @@ def render_inertia(
     :param component_name: The component name used in your frontend framework
     :param props: A dict of properties used in your component
     :param view_data: A dict of data that will not be sent to your JavaScript component
+    :param stream: Stream the HTML response, flushing the template until the page
+                   object is needed before evaluating props (by default the
+                   ``INERTIA_STREAM`` config value)
+    :param normalize: Send the objects repeated in props once in the page ``refs``
+                      table, replaced by ``{"$ref": id}`` pointers in props (by
+                      default the ``INERTIA_NORMALIZE_REFS`` config value)
+    :param timeout: Time budget in seconds of the props declared with
+                    ``deadline_include``, whatever their own timeout (by default
+                    the ``INERTIA_RENDER_TIMEOUT`` config value)
     """
     inertia_template = current_app.config.get("INERTIA_TEMPLATE")
     if inertia_template is None:
@@ -79,63 +144,158 @@ def render_inertia(
         )
 
     inertia_version = get_asset_version()
-    refresh_props = request.headers.getlist("X-Inertia-Partial-Data")
-    if len(refresh_props) == 1 and "," in refresh_props[0]:
-        refresh_props = list(
-            filter(
-                None, request.headers.get("X-Inertia-Partial-Data", "").split(",")
-            )
-        )
-    if (
-        refresh_props
-        and request.headers.get("X-Inertia-Partial-Component", "") == component_name
-    ):
-        props = {
-            key: value
-            for key, value in props.items()
-            if key in refresh_props or isinstance(value, AlwaysProp)
-        }
-    else:
-        props = {
-            key: value
-            for key, value in props.items()
-            if not callable(value) or not isinstance(value, LazyProp)
-        }
+    partial_keys = get_partial_keys(request.headers, component_name)
+    selected_props = select_props(partial_keys, props)
+    page = build_page(
+        component_name, request.url, inertia_version, props, partial_keys
+    )
 
-    extension = current_app.extensions["inertia"]
-    merged_props = {**props, **extension._shared_data}
-    for key, value in merged_props.items():
-        if callable(value):
-            merged_props[key] = value()
-        else:
-            merged_props[key] = value
+    if normalize is None:
+        normalize = current_app.config.get("INERTIA_NORMALIZE_REFS", False)
 
-    if request.headers.get("X-Inertia", False):
-        response = jsonify(
-            {
-                "component": component_name,
-                "props": merged_props,
-                "version": inertia_version,
-                "url": request.url,
-            }
+    if timeout is None:
+        timeout = current_app.config.get("INERTIA_RENDER_TIMEOUT")
+
+    def resolve_props(page: Dict[str, Any]) -> Dict[str, Any]:
+        return _resolve_props(
+            selected_props, props, page, timeout, allow_defer=partial_keys is None
         )
+
+    if request.headers.get("X-Inertia", False):
+        resolved_props = resolve_props(page)
+        page = Page(page, props=resolved_props)
+        page.normalize = normalize
+        msgpack_mimetype = negotiate_msgpack(request.accept_mimetypes)
+        if msgpack_mimetype is not None:
+            response = current_app.response_class(
+                dumps_msgpack(page, current_app.extensions["inertia"].serializers),
+                mimetype=msgpack_mimetype,
+            )
+        else:
+            response = jsonify(page)
         response.headers["X-Inertia"] = True
         response.headers["Vary"] = "Accept"
         return response
 
-    context = {
-        "view_data": view_data,
-        "page": {
-            "version": inertia_version,
-            "url": request.url,
-            "component": component_name,
-            "props": merged_props,
-        },
-    }
+    if stream is None:
+        stream = current_app.config.get("INERTIA_STREAM", False)
+
+    if stream:
+        page = _StreamedPage(resolve_props, **page)
+        page.normalize = normalize
+        context = {"view_data": view_data, "page": page}
+        return current_app.response_class(
+            stream_template(inertia_template, **context), mimetype="text/html"
+        )
+
+    resolved_props = resolve_props(page)
+    page = Page(page, props=resolved_props)
+    page.normalize = normalize
+    context = {"view_data": view_data, "page": page}
 
     return render_template(inertia_template, **context)
 
 
+def _resolve_props(
+    selected_props: Dict[str, Any],
+    props: Dict[str, Any],
+    page: Dict[str, Any],
+    timeout: Optional[float] = None,
+    allow_defer: bool = True,
+) -> Dict[str, Any]:
+    """Merge shared data into component props and evaluate them.
+
+    Each prop, resource or dependency is evaluated at most once. Unselected props
+    are only evaluated if a selected prop depends on them. Props with a deadline
+    run concurrently in the extension thread pool, those deferred on timeout are
+    added to the page ``deferredProps``.
+
+    :param selected_props: The component props selected for the response
+    :param props: All the component props
+    :param page: The page object the props are sent with
+    :param timeout: Time budget of the props with a deadline
+    :param allow_defer: Convert props missing their deadline into deferred props
+    """
+    extension = current_app.extensions["inertia"]
+    shared_data = extension.get_shared_data()
+    resolver = PropResolver(
+        ChainMap(shared_data, props),
+        extension._resources,
+        g.setdefault("_inertia_resources", {}),
+        submit=_submit,
+        deadline=None if timeout is None else time.monotonic() + timeout,
+        allow_defer=allow_defer,
+    )
+    keys = ChainMap(shared_data, selected_props)
+    resolver.start(keys)
+    profiler = g.get("_inertia_profiler")
+    resolved_props = {}
+    for key in keys:
+        try:
+            with profiler.prop(key) if profiler is not None else nullcontext():
+                resolved_props[key] = resolver.resolve(key)
+        except DeadlineExceeded as exc:
+            defer_prop(page, key, exc.group)
+
+    for key, prop in resolver.missed.items():
+        prop_deadline_missed.send(
+            current_app._get_current_object(),
+            component=page["component"],
+            key=key,
+            deferred=prop.group is not None,
+        )
+
+    return resolved_props
+
+
+def _submit(func: Callable) -> Future:
+    """Run a callable in the extension thread pool with the current request context.
+
+    The callable runs in a copy of the current context variables: the request and
+    application contexts are bound without being pushed again, so that the
+    request teardown functions only run once, when the request ends.
+
+    :param func: The callable to run
+    """
+    executor = current_app.extensions["inertia"]._get_executor()
+    return executor.submit(contextvars.copy_context().run, func)
+
+
+class _StreamedPage(Page):
+    """Inertia page object evaluating its props on first access.
+
+    Used by streamed responses, the template is flushed up to the first use of
+    the page props (usually the ``data-page`` attribute) before they are evaluated.
+    """
+
+    def __init__(self, resolve_props: Callable[[Page], Dict[str, Any]], **page: Any):
+        super().__init__(page, props=None)
+        self._resolve_props = resolve_props
+
+    def _resolve(self):
+        if self._resolve_props is not None:
+            dict.__setitem__(self, "props", self._resolve_props(self))
+            self._resolve_props = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "props":
+            self._resolve()
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "props":
+            self._resolve()
+        return super().get(key, default)
+
+    def items(self):
+        self._resolve()
+        return super().items()
+
+    def values(self):
+        self._resolve()
+        return super().values()
+
+
 def inertia_location(location: str) -> Response:
     """Redirects to an external website, or even another non-Inertia endpoint.
 
@@ -173,9 +333,125 @@ def lazy_include(callback: Callable) -> LazyProp:
     return LazyProp(callback)
 
 
+def defer_include(callback: Callable, group: str = "default") -> DeferredProp:
+    """Specify that a prop is not included in the page but loaded by the client once the page is rendered.
+
+    The page object lists the deferred props so that Inertia clients (version 2 and
+    later) request them in a partial reload. Props of a same group are fetched in
+    the same request.
+
+    :param callback: Callable wrapping the props data
+    :param group: Name of the group the prop is fetched with
+    """
+    if not callable(callback):
+        raise ValueError("Props ``callback`` must be a callable.")
+
+    return DeferredProp(callback, group)
+
+
 def always_include(prop_value: Any) -> AlwaysProp:
     """Specify that a prop should always be included, even if it has not been explicitly required in a partial reload.
 
     :param prop_value: The props data or a callable wrapping the data
     """
     return AlwaysProp(prop_value)
+
+
+def depends_include(callback: Callable, *dependencies: str) -> DependentProp:
+    """Specify that a prop is computed from other props or request-scoped resources.
+
+    The callback receives the dependencies, resolved at most once per response, as
+    keyword arguments.
+
+    :param callback: Callable computing the prop data from its dependencies
+    :param dependencies: Names of the props or resources the prop depends on
+    """
+    if not callable(callback):
+        raise ValueError("Props ``callback`` must be a callable.")
+
+    return DependentProp(callback, dependencies)
+
+
+def coalesced_include(
+    key: Union[Hashable, Callable[[], Hashable]], callback: Callable
+) -> CoalescedProp:
+    """Specify that concurrent evaluations of a prop share a single computation.
+
+    While the prop is computed for a request, other requests evaluating a prop
+    with the same key wait for this computation and share its result. The key
+    must identify the data, if it depends on the current user it should include
+    the user identifier.
+
+    :param key: The computation key or a callable returning it
+    :param callback: Callable wrapping the props data
+    """
+    if not callable(callback):
+        raise ValueError("Props ``callback`` must be a callable.")
+
+    return CoalescedProp(key, callback)
+
+
+def table_include(rows: Any, columns: Optional[Iterable[str]] = None) -> TableProp:
+    """Specify that a prop is a table encoded column by column.
+
+    Column names are sent once and the values of each column as an array, instead
+    of repeating every key in every row. ``rows`` can be a list of mappings, a list
+    of objects (``columns`` are then required), a mapping of columns, a pandas data
+    frame or a NumPy structured array, or a callable returning one of them.
+    Array-backed columns are converted with their ``tolist`` method without
+    building a dict per row.
+
+    The client rehydrates the table, see :ref:`tables <tables>`.
+
+    :param rows: The table rows or columns, or a callable returning them
+    :param columns: Names of the columns to include, in order
+    """
+    return TableProp(rows, columns)
+
+
+def raw_json_include(
+    data: Union[bytes, str, Callable[[], Union[bytes, str]]],
+) -> RawJSONProp:
+    """Specify that a prop is already serialized as JSON.
+
+    The JSON text is spliced verbatim into the page object instead of being parsed
+    then encoded again, in JSON responses as in the HTML page. A fragment is
+    validated the first time it is sent, then recognized by its digest. If the
+    application JSON provider can not be extended by the extension, the fragment is
+    decoded and encoded again like other props.
+
+    .. code-block:: python
+
+       props = {"config": raw_json_include(cache.get("config"))}
+
+    :param data: The JSON text or bytes, or a callable returning them
+    """
+    return RawJSONProp(data)
+
+
+def deadline_include(
+    callback: Callable,
+    timeout: Optional[float] = None,
+    fallback: Any = None,
+    group: Optional[str] = None,
+) -> DeadlineProp:
+    """Specify that a prop is not waited for longer than a timeout.
+
+    The prop is computed in the extension thread pool, concurrently with the other
+    props. If it is not computed in time, it is converted into a deferred prop of
+    ``group`` when set, fetched by the client once the page is rendered, or it is
+    replaced by ``fallback``. The render ``timeout`` of ``render_inertia`` bounds
+    the time waited for all the props with a deadline.
+
+    A prop missing its deadline keeps running in the background until it returns,
+    the ``prop_deadline_missed`` signal is sent for instrumentation.
+
+    :param callback: Callable wrapping the props data
+    :param timeout: Time in seconds the prop is waited for
+    :param fallback: Value, or callable returning the value, sent on timeout
+    :param group: Convert the prop into a deferred prop of this group on timeout
+    """
+    if not callable(callback):
+        raise ValueError("Props ``callback`` must be a callable.")
+
+    return DeadlineProp(callback, timeout, fallback, group)
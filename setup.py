@@ -67,7 +67,11 @@ setup(
     zip_safe=False,
     platforms="any",
     install_requires=requirements,
-    extras_require={"tests": tests_requirements},
+    extras_require={
+        "tests": tests_requirements,
+        "msgpack": ["msgpack>=1.0"],
+        "quart": ["quart>=0.19"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "License :: OSI Approved :: MIT License",
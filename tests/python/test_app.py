@@ -23,22 +23,61 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import asyncio
+import collections
+import dataclasses
+import datetime
+import decimal
+import enum
+import json
+import os
 import re
+import secrets
+import shutil
+import tempfile
+import threading
+import time
 import unittest
+import uuid
 from http import HTTPStatus
 from unittest.mock import patch
 
-from flask import Flask, redirect, url_for
+import msgpack
+from flask import Flask, redirect, render_template, request, session, url_for
+from flask.json.provider import DefaultJSONProvider, JSONProvider
 from parameterized import parameterized
 
+try:
+    import quart
+except ImportError:  # pragma: no cover
+    quart = None
+
 from flask_inertia import (
     Inertia,
     always_include,
+    coalesced_include,
+    deadline_include,
+    defer_include,
+    depends_include,
     inertia_location,
     lazy_include,
+    raw_json_include,
     render_inertia,
+    table_include,
+)
+from flask_inertia.bench import BenchRequest, run_bench
+from flask_inertia.budget import PayloadBudgetExceeded
+from flask_inertia.cache import TTLCache
+from flask_inertia.encoding import SerializerRegistry, normalize_props
+from flask_inertia.profiling import DirectorySink, LogSink
+from flask_inertia.signals import prop_deadline_missed
+from flask_inertia.singleflight import SingleFlight
+from flask_inertia.unittest import (
+    InertiaTestClient,
+    InertiaTestResponse,
+    extract_page,
 )
-from flask_inertia.unittest import InertiaTestResponse
+from flask_inertia.version import VersionGate, get_asset_version
 
 
 class TestConfig:
@@ -95,6 +134,10 @@ def meta():
     )
 
 
+def streamed():
+    return render_inertia("Streamed", props={"a": a}, stream=True)
+
+
 class TestInertia(unittest.TestCase):
     """Flask-Inertia tests."""
 
@@ -298,6 +341,36 @@ class TestInertia(unittest.TestCase):
             response.data,
         )
 
+    def test_streamed_response(self):
+        self.app.add_url_rule("/streamed/", "streamed", streamed)
+        chunks = []
+
+        def streamed_prop():
+            chunks.append(b"<evaluated>")
+            return "a"
+
+        with patch("tests.python.test_app.a", streamed_prop):
+            response = self.client.get("/streamed/")
+            self.assertTrue(response.is_streamed)
+            chunks.extend(response.response)
+
+        content = b"".join(chunks)
+        self.assertLess(content.index(b"<title>"), content.index(b"<evaluated>"))
+        self.assertIn(b'"component": "Streamed"', content)
+        self.assertIn(b'"a": "a"', content)
+
+    def test_streamed_response_from_config(self):
+        self.app.config["INERTIA_STREAM"] = True
+        response = self.client.get("/partial/")
+        self.assertTrue(response.is_streamed)
+        self.assertIn(b'"a": "a"', response.get_data())
+
+    def test_streamed_response_not_used_for_inertia_requests(self):
+        self.app.add_url_rule("/streamed/", "streamed", streamed)
+        response = self.client.get("/streamed/", headers={"X-Inertia": "true"})
+        self.assertTrue(response.is_json)
+        self.assertIn(b'"a":"a"', response.data)
+
     def test_share_values(self):
         self.inertia.share("foo", "bar")
         response = self.client.get("/")
@@ -311,6 +384,24 @@ class TestInertia(unittest.TestCase):
         response = self.client.get("/")
         self.assertIn(b'"fizz": "buzz"', response.data)
 
+    def test_share_request_values(self):
+        self.inertia.share("foo", "bar")
+
+        @self.app.before_request
+        def share_user():
+            if request.path == "/partial/":
+                self.inertia.share("user", "john")
+                self.inertia.share("foo", "baz")
+
+        response = self.client.get("/partial/")
+        self.assertIn(b'"user": "john"', response.data)
+        self.assertIn(b'"foo": "baz"', response.data)
+
+        response = self.client.get("/")
+        self.assertNotIn(b'"user"', response.data)
+        self.assertIn(b'"foo": "bar"', response.data)
+        self.assertEqual(self.inertia._shared_data, {"foo": "bar"})
+
     def test_not_duplicated_shared_value_in_props(self):
         self.inertia.share("e", "shared_data")
         response = self.client.get("/partial/")
@@ -340,6 +431,1852 @@ class TestInertia(unittest.TestCase):
         self.assertEqual(response.status_code, HTTPStatus.OK)
 
 
+class TestWarmUp(unittest.TestCase):
+    """Precomputed values tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.add_url_rule("/", "index", index)
+
+    def test_init_app_precompute(self):
+        with patch("flask_inertia.core.render_router") as render_mock:
+            render_mock.return_value = "window.routes={}"
+            inertia = Inertia()
+            inertia.init_app(self.app, precompute=True)
+            self.assertEqual(render_mock.call_count, 1)
+            self.assertEqual(len(inertia._asset_versions), 1)
+
+            self.app.test_client().get("/")
+            self.assertEqual(render_mock.call_count, 1)
+
+    def test_router_cache_invalidated_by_new_routes(self):
+        inertia = Inertia(self.app)
+        inertia.warm_up()
+        inertia.add_shorthand_route("/faq/", "FAQ")
+        response = self.app.test_client().get("/")
+        self.assertIn(b'"faq":"/faq/"', response.data)
+
+    def test_asset_version_cached(self):
+        Inertia(self.app)
+        with self.app.app_context():
+            version = get_asset_version()
+            with patch("builtins.open") as open_mock:
+                self.assertEqual(get_asset_version(), version)
+                self.assertFalse(open_mock.called)
+
+    def test_asset_version_not_cached_with_templates_auto_reload(self):
+        self.app.config["TEMPLATES_AUTO_RELOAD"] = True
+        Inertia(self.app)
+        with self.app.app_context():
+            get_asset_version()
+            with patch("flask_inertia.core.open") as open_mock:
+                open_mock.side_effect = OSError
+                with self.assertRaises(OSError):
+                    get_asset_version()
+
+
+class TestBuild(unittest.TestCase):
+    """Build artifacts tests."""
+
+    def setUp(self):
+        self.build_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.build_dir)
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.add_url_rule("/", "index", index)
+        Inertia(self.app)
+
+    def test_build_command(self):
+        result = self.app.test_cli_runner().invoke(
+            args=["inertia", "build", "--output", self.build_dir]
+        )
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("Inertia artifacts written", result.output)
+        self.assertTrue(os.path.exists(os.path.join(self.build_dir, "router.js")))
+
+        with open(os.path.join(self.build_dir, "manifest.json")) as manifest_file:
+            manifest = json.load(manifest_file)
+        with self.app.app_context():
+            self.assertEqual(manifest["version"], get_asset_version())
+
+    def test_build_command_without_output(self):
+        result = self.app.test_cli_runner().invoke(args=["inertia", "build"])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("INERTIA_BUILD_DIR", result.output)
+
+    def test_build_artifacts_used_at_runtime(self):
+        self.app.config["INERTIA_BUILD_DIR"] = self.build_dir
+        self.app.test_cli_runner().invoke(args=["inertia", "build"])
+        with open(os.path.join(self.build_dir, "manifest.json"), "w") as manifest:
+            json.dump({"version": "1234", "router": "router.js"}, manifest)
+
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        app.config["INERTIA_BUILD_DIR"] = self.build_dir
+        app.add_url_rule("/", "index", index)
+        Inertia(app)
+        with patch("flask_inertia.core.render_router") as render_mock:
+            response = app.test_client().get("/")
+            self.assertFalse(render_mock.called)
+
+        self.assertIn(b'window.routes={"index":"/"', response.data)
+        self.assertIn(b'"version": "1234"', response.data)
+
+
+def create_bench_app():
+    app = Flask(__name__, template_folder=".")
+    app.config.from_object(TestConfig)
+    app.add_url_rule("/", "index", index)
+    app.add_url_rule("/partial/", "partial", partial_loading)
+    Inertia(app)
+    return app
+
+
+class TestBench(unittest.TestCase):
+    """Bench command tests."""
+
+    def setUp(self):
+        self.app = create_bench_app()
+        self.requests = [
+            BenchRequest("/"),
+            BenchRequest("/partial/", "navigate", weight=2),
+            BenchRequest("/partial/", "partial", component="Partial", only=("a",)),
+            BenchRequest("/missing/"),
+        ]
+
+    def test_run_bench(self):
+        report = run_bench(self.app, self.requests, count=50)
+        self.assertEqual(report.requests, 50)
+        self.assertEqual(set(report.components), {"Index", "Partial", "/missing/"})
+        partial = report.components["Partial"]
+        self.assertEqual(partial.requests, 30)
+        self.assertEqual(partial.errors, 0)
+        self.assertLessEqual(partial.p50, partial.p95)
+        self.assertLessEqual(partial.p95, partial.p99)
+        self.assertEqual(report.components["/missing/"].errors, 10)
+        self.assertGreater(report.components["Index"].size, partial.size)
+
+    def test_run_bench_workers(self):
+        report = run_bench(
+            self.app,
+            self.requests[:2],
+            count=20,
+            workers=2,
+            create_app=create_bench_app,
+        )
+        self.assertEqual(report.workers, 2)
+        self.assertEqual(report.components["Index"].requests, 8)
+        self.assertEqual(report.components["Partial"].requests, 12)
+
+    def test_bench_command(self):
+        scenario = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        self.addCleanup(os.remove, scenario.name)
+        json.dump(
+            [{"path": "/partial/", "kind": "partial", "component": "Partial"}],
+            scenario,
+        )
+        scenario.close()
+        runner = self.app.test_cli_runner()
+
+        result = runner.invoke(args=["inertia", "bench", "-s", scenario.name])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("component", result.output)
+
+        output = os.path.join(tempfile.mkdtemp(), "report.json")
+        self.addCleanup(shutil.rmtree, os.path.dirname(output))
+        args = ["inertia", "bench", "/", "-k", "navigate", "-n", "10", "-w", "1"]
+        result = runner.invoke(args=args + ["-o", output])
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("10 requests in", result.output)
+        with open(output) as report:
+            self.assertEqual(
+                json.load(report)["components"]["Index"]["requests"], 10
+            )
+
+
+class TestCachedShorthandRoute(unittest.TestCase):
+    """Cached shorthand routes tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+        self.inertia.add_shorthand_route("/faq/", "FAQ", cache=True)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_cached_responses(self):
+        with patch(
+            "flask_inertia.views.render_template", wraps=render_template
+        ) as render_mock:
+            first = self.client.get("/faq/")
+            second = self.client.get("/faq/")
+            self.assertEqual(render_mock.call_count, 1)
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.inertia("app").component, "FAQ")
+
+        response = self.client.get("/faq/", headers={"X-Inertia": "true"})
+        self.assertTrue(response.is_json)
+        self.assertEqual(response.headers["X-Inertia"], "True")
+        self.assertEqual(response.inertia("app").component, "FAQ")
+
+    def test_cache_invalidated_by_shared_data(self):
+        self.inertia.share("foo", "bar")
+        self.assertEqual(self.client.get("/faq/").inertia("app").props.foo, "bar")
+        self.inertia.share("foo", "baz")
+        self.assertEqual(self.client.get("/faq/").inertia("app").props.foo, "baz")
+
+    def test_not_cached_for_authenticated_visitors(self):
+        self.app.secret_key = "secret"
+        self.client.get("/faq/")
+        with self.client.session_transaction() as client_session:
+            client_session["user"] = "foo"
+        with patch(
+            "flask_inertia.views.render_template", wraps=render_template
+        ) as render_mock:
+            self.client.get("/faq/")
+            self.client.get("/faq/", headers={"Authorization": "Bearer foo"})
+            self.assertEqual(render_mock.call_count, 2)
+
+    def test_not_cached_when_render_uses_session(self):
+        self.app.secret_key = "secret"
+
+        @self.app.context_processor
+        def csrf_token():
+            return {"csrf_token": session.setdefault("csrf", secrets.token_hex())}
+
+        first = self.app.test_client().get("/faq/")
+        second = self.app.test_client().get("/faq/")
+        self.assertIn("Set-Cookie", first.headers)
+        self.assertIn("Set-Cookie", second.headers)
+        self.assertNotEqual(
+            first.headers["Set-Cookie"], second.headers["Set-Cookie"]
+        )
+
+    def test_not_cached_with_computed_shared_data(self):
+        values = iter(["a", "b"])
+        self.inertia.share("foo", lambda: next(values))
+        self.assertEqual(self.client.get("/faq/").inertia("app").props.foo, "a")
+        self.assertEqual(self.client.get("/faq/").inertia("app").props.foo, "b")
+
+
+class TestPageCache(unittest.TestCase):
+    """Anonymous pages cache tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["SECRET_KEY"] = "secret"
+        self.inertia = Inertia(self.app)
+        self.calls = 0
+
+        @self.app.route("/products/")
+        @self.inertia.cache_page(tags=["products"], vary=["Accept-Language"])
+        def products():
+            self.calls += 1
+            return render_inertia("Products", props={"calls": self.calls})
+
+        @self.app.route("/login/")
+        def login():
+            session["user_id"] = 1
+            return "ok"
+
+        self.client = self.app.test_client()
+
+    def test_cached_page(self):
+        first = self.client.get("/products/")
+        second = self.client.get("/products/")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(self.calls, 1)
+
+        response = self.client.get("/products/", headers={"X-Inertia": "true"})
+        self.assertTrue(response.is_json)
+        self.assertEqual(self.calls, 2)
+
+        self.client.get("/products/", headers={"Accept-Language": "fr"})
+        self.assertEqual(self.calls, 3)
+
+    def test_tags_invalidation(self):
+        self.client.get("/products/")
+        self.inertia.page_cache.invalidate("users")
+        self.client.get("/products/")
+        self.assertEqual(self.calls, 1)
+        self.inertia.page_cache.invalidate("products")
+        self.client.get("/products/")
+        self.assertEqual(self.calls, 2)
+
+    def test_bypassed_for_authenticated_users(self):
+        self.client.get("/products/")
+        self.client.get("/login/")
+        self.client.get("/products/")
+        self.client.get("/products/")
+        self.assertEqual(self.calls, 3)
+
+        self.app.test_client().get(
+            "/products/", headers={"Authorization": "Bearer foo"}
+        )
+        self.assertEqual(self.calls, 4)
+
+    def test_not_cached_when_view_uses_session(self):
+        @self.app.context_processor
+        def csrf_token():
+            return {"csrf_token": session.setdefault("csrf", secrets.token_hex())}
+
+        first = self.app.test_client().get("/products/")
+        second = self.app.test_client().get("/products/")
+        self.assertEqual(self.calls, 2)
+        self.assertNotEqual(
+            first.headers["Set-Cookie"], second.headers["Set-Cookie"]
+        )
+
+        self.app.test_client().get("/products/", headers={"X-Inertia": "true"})
+        self.app.test_client().get("/products/", headers={"X-Inertia": "true"})
+        self.assertEqual(self.calls, 3)
+
+
+class TestPageRegistry(unittest.TestCase):
+    """Registered pages tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+        self.calls = 0
+
+        @self.app.route("/users/")
+        @self.inertia.page("Users", cache=True, deferred=["stats"])
+        def users():
+            self.calls += 1
+            return {"users": ["foo"], "stats": lambda: 42, "flag": defer_include(b)}
+
+        @self.app.route("/old/")
+        @self.inertia.page("Old")
+        def old():
+            return redirect(url_for("users"))
+
+        @self.app.route("/api/")
+        def api():
+            return {"data": 1}
+
+        self.inertia.add_shorthand_route("/faq/", "FAQ")
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_registered_before_init_app(self):
+        inertia = Inertia()
+
+        @inertia.page("Users", cache=True)
+        def users():
+            return {"users": ["foo"]}
+
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        app.add_url_rule("/users/", "users", users)
+        inertia.init_app(app)
+        self.assertEqual(set(inertia.pages), {"Users"})
+        response = app.test_client().get("/users/", headers={"X-Inertia": "true"})
+        self.assertEqual(response.json["props"], {"users": ["foo"]})
+
+    def test_registry(self):
+        self.assertEqual(set(self.inertia.pages), {"Users", "Old", "FAQ"})
+        self.assertEqual(self.inertia.pages["Users"].deferred, ("stats",))
+
+    def test_page_view(self):
+        data = self.client.get("/users/").inertia("app")
+        self.assertEqual(data.component, "Users")
+        self.assertEqual(data.props.users, ["foo"])
+        self.assertFalse(hasattr(data.props, "stats"))
+        self.assertEqual(data.deferredProps.default, ["stats", "flag"])
+
+        self.client.get("/users/")
+        self.assertEqual(self.calls, 1)
+
+        response = self.client.get("/old/")
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_deferred_props_partial_reload(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "X-Inertia-Partial-Data": ["stats,flag"],
+            "X-Inertia-Partial-Component": "Users",
+        }
+        data = self.client.get("/users/", headers=headers).inertia("app")
+        self.assertEqual(data.props.stats, 42)
+        self.assertEqual(data.props.flag, "b")
+        self.assertFalse(hasattr(data, "deferredProps"))
+
+    def test_registered_pages_only(self):
+        headers = {"X-Requested-With": "XMLHttpRequest"}
+        response = self.client.get("/api/", headers=headers)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        self.app.config["INERTIA_REGISTERED_PAGES_ONLY"] = True
+        response = self.client.get("/api/", headers=headers)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        response = self.client.get("/faq/", headers=headers)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_invalid_defer_include_type(self):
+        with self.assertRaises(ValueError):
+            defer_include("not a callable")
+
+
+class TestPrefetchCache(unittest.TestCase):
+    """Prefetch response cache tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_PREFETCH_CACHE_TTL"] = 30
+        self.calls = 0
+
+        def counter():
+            self.calls += 1
+            return render_inertia("Counter", props={"calls": self.calls})
+
+        self.app.add_url_rule("/counter/", "counter", counter)
+        self.inertia = Inertia(self.app)
+        self.client = self.app.test_client()
+        with self.app.test_request_context():
+            self.headers = {
+                "X-Inertia": "true",
+                "X-Requested-With": "XMLHttpRequest",
+                "X-Inertia-Version": get_asset_version(),
+                "Authorization": "Bearer foo",
+            }
+
+    def test_visit_served_from_prefetch(self):
+        response = self.client.get(
+            "/counter/", headers={**self.headers, "Purpose": "prefetch"}
+        )
+        self.assertIn(b'"calls":1', response.data)
+
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(b'"calls":1', response.data)
+        self.assertEqual(response.headers["X-Inertia"], "True")
+        self.assertEqual(self.calls, 1)
+
+        # prefetched responses are only used once
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":2', response.data)
+
+    def test_prefetch_cache_per_user(self):
+        self.client.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+        response = self.client.get(
+            "/counter/", headers={**self.headers, "Authorization": "Bearer bar"}
+        )
+        self.assertIn(b'"calls":2', response.data)
+
+    def test_prefetch_cache_per_auth_cookie(self):
+        del self.headers["Authorization"]
+        alice = self.app.test_client()
+        alice.set_cookie("remember_token", "alice")
+        alice.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":2', response.data)
+        self.client.set_cookie("remember_token", "bob")
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":3', response.data)
+        response = alice.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":1', response.data)
+
+    def test_prefetch_without_identity_not_cached(self):
+        del self.headers["Authorization"]
+        self.client.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":2', response.data)
+
+    def test_prefetch_cookies_not_replayed(self):
+        @self.app.after_request
+        def set_cookie(response):
+            response.set_cookie("session", "prefetch")
+            return response
+
+        client = self.app.test_client(use_cookies=False)
+        client.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+        with patch.object(self.app, "after_request_funcs", {}):
+            response = client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":1', response.data)
+        self.assertNotIn("Set-Cookie", response.headers)
+
+    def test_prefetch_cache_expiration(self):
+        self.client.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+        now = time.monotonic()
+        with patch("flask_inertia.cache.time") as time_mock:
+            time_mock.monotonic.return_value = now + 60
+            response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":2', response.data)
+
+    def test_prefetch_cache_disabled(self):
+        del self.app.config["INERTIA_PREFETCH_CACHE_TTL"]
+        self.client.get("/counter/", headers={**self.headers, "Purpose": "prefetch"})
+        response = self.client.get("/counter/", headers=self.headers)
+        self.assertIn(b'"calls":2', response.data)
+
+
+class TestPropDependencies(unittest.TestCase):
+    """Prop dependency graph tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.queries = []
+
+        def orders_view():
+            return render_inertia(
+                "Orders",
+                props={
+                    "orders": depends_include(lambda orders: orders, "orders"),
+                    "order_count": depends_include(
+                        lambda orders: len(orders), "orders"
+                    ),
+                    "revenue": lazy_include(
+                        depends_include(lambda total: total, "total")
+                    ),
+                    "total": lazy_include(
+                        depends_include(lambda orders: sum(orders), "orders")
+                    ),
+                },
+            )
+
+        def circular_view():
+            return render_inertia(
+                "Circular",
+                props={
+                    "a": depends_include(lambda b: b, "b"),
+                    "b": depends_include(lambda a: a, "a"),
+                },
+            )
+
+        self.app.add_url_rule("/orders/", "orders", orders_view)
+        self.app.add_url_rule("/circular/", "circular", circular_view)
+        self.inertia = Inertia(self.app)
+
+        @self.inertia.resource("orders")
+        def orders():
+            self.queries.append("orders")
+            return [1, 2, 3]
+
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_registered_before_init_app(self):
+        inertia = Inertia()
+
+        @inertia.resource("orders")
+        def orders():
+            return [1, 2]
+
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        app.add_url_rule(
+            "/orders/",
+            "orders",
+            lambda: render_inertia(
+                "Orders",
+                props={
+                    "orders": depends_include(lambda orders: len(orders), "orders")
+                },
+            ),
+        )
+        inertia.init_app(app)
+        response = app.test_client().get("/orders/", headers={"X-Inertia": "true"})
+        self.assertEqual(response.json["props"], {"orders": 2})
+
+    def test_dependencies_evaluated_once(self):
+        response = self.client.get("/orders/")
+        data = response.inertia("app")
+        self.assertEqual(data.props.orders, [1, 2, 3])
+        self.assertEqual(data.props.order_count, 3)
+        self.assertFalse(hasattr(data.props, "revenue"))
+        self.assertFalse(hasattr(data.props, "total"))
+        self.assertEqual(self.queries, ["orders"])
+
+    def test_dependencies_on_unsent_props(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "X-Inertia-Partial-Data": ["revenue"],
+            "X-Inertia-Partial-Component": "Orders",
+        }
+        response = self.client.get("/orders/", headers=headers)
+        data = response.inertia("app")
+        self.assertEqual(data.props.revenue, 6)
+        self.assertFalse(hasattr(data.props, "total"))
+        self.assertEqual(self.queries, ["orders"])
+
+    def test_unneeded_dependencies_skipped(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "X-Inertia-Partial-Data": ["foo"],
+            "X-Inertia-Partial-Component": "Orders",
+        }
+        self.client.get("/orders/", headers=headers)
+        self.assertEqual(self.queries, [])
+
+    def test_circular_dependencies(self):
+        with self.assertRaises(ValueError) as ctx:
+            self.client.get("/circular/")
+
+        self.assertIn("Circular dependency", str(ctx.exception))
+
+    def test_invalid_depends_include_type(self):
+        with self.assertRaises(ValueError):
+            depends_include("not a callable", "orders")
+
+
+class TestLiveProps(unittest.TestCase):
+    """Live props channel tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_LIVE_URL"] = "/live/"
+        self.app.config["INERTIA_LIVE_HEARTBEAT"] = 0.01
+        self.inertia = Inertia(self.app)
+        self.client = self.app.test_client()
+
+    def test_live_stream(self):
+        response = self.client.get("/live/dashboard")
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = iter(response.response)
+        self.assertEqual(next(events), b": connected\n\n")
+        self.assertEqual(next(events), b": heartbeat\n\n")
+
+        self.inertia.publish("dashboard", {"visits": 1, "users": 2})
+        self.assertEqual(
+            next(events), b'event: props\ndata: {"users":2,"visits":1}\n\n'
+        )
+
+        # only changed values are pushed
+        self.inertia.publish("dashboard", {"visits": 1, "users": 3})
+        self.assertEqual(next(events), b'event: props\ndata: {"users":3}\n\n')
+
+        # values mutated in place are pushed
+        users = [1]
+        self.inertia.publish("dashboard", {"users": users})
+        self.assertEqual(next(events), b'event: props\ndata: {"users":[1]}\n\n')
+        users.append(2)
+        self.inertia.publish("dashboard", {"users": users})
+        self.assertEqual(next(events), b'event: props\ndata: {"users":[1,2]}\n\n')
+
+        response.close()
+        self.assertEqual(self.inertia.broker._subscriptions, {})
+
+    def test_live_sources_mutated_in_place(self):
+        visits = [1]
+
+        @self.inertia.live_source("dashboard", "visits")
+        def visits_source():
+            return visits
+
+        subscription = self.inertia.broker.subscribe("dashboard")
+        with self.app.app_context():
+            self.inertia.refresh("dashboard")
+            self.assertEqual(subscription.get(timeout=0), {"visits": [1]})
+            visits.append(2)
+            self.inertia.refresh("dashboard")
+            self.assertEqual(subscription.get(timeout=0), {"visits": [1, 2]})
+
+        subscription.close()
+
+    def test_live_sources_registered_before_init_app(self):
+        inertia = Inertia()
+
+        @inertia.live_source("dashboard", "visits")
+        def visits_source():
+            return 1
+
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        inertia.init_app(app)
+        subscription = inertia.broker.subscribe("dashboard")
+        with app.app_context():
+            inertia.refresh("dashboard")
+        self.assertEqual(subscription.get(timeout=0), {"visits": 1})
+        subscription.close()
+
+    def test_live_sources(self):
+        visits = [1]
+
+        @self.inertia.live_source("dashboard", "visits")
+        def visits_source():
+            return visits[0]
+
+        subscription = self.inertia.broker.subscribe("dashboard")
+        with self.app.app_context():
+            self.inertia.refresh("dashboard")
+            self.assertEqual(subscription.get(timeout=0), {"visits": 1})
+            self.inertia.refresh("dashboard")
+            self.assertEqual(subscription.get(timeout=0), {})
+            visits[0] = 2
+            self.inertia.refresh("dashboard")
+            self.assertEqual(subscription.get(timeout=0), {"visits": 2})
+
+        subscription.close()
+
+    def test_live_url_not_configured(self):
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        Inertia(app)
+        self.assertNotIn("inertia_live", app.view_functions)
+
+
+class TestCoalescedProps(unittest.TestCase):
+    """Singleflight props evaluation tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+
+    def test_concurrent_evaluations_coalesced(self):
+        started, release = threading.Event(), threading.Event()
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        prop = coalesced_include("stats", compute)
+
+        def worker():
+            with self.app.app_context():
+                results.append(prop())
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=worker)
+        follower.start()
+        time.sleep(0.05)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [42, 42])
+
+        # results are not cached once the computation is over
+        with self.app.app_context():
+            prop()
+        self.assertEqual(calls, [1, 1])
+
+    def test_errors_shared(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            flights.do("key", fail)
+        self.assertEqual(flights.do("key", lambda: "ok"), "ok")
+
+    def test_coalesced_dependent_prop(self):
+        self.app.response_class = InertiaTestResponse
+
+        @self.inertia.resource("orders")
+        def orders():
+            return [1, 2]
+
+        def view():
+            return render_inertia(
+                "Orders",
+                props={
+                    "count": coalesced_include(
+                        "count",
+                        depends_include(lambda orders: len(orders), "orders"),
+                    ),
+                },
+            )
+
+        self.app.add_url_rule("/orders/", "orders", view)
+        data = self.app.test_client().get("/orders/").inertia("app")
+        self.assertEqual(data.props.count, 2)
+
+    def test_invalid_coalesced_include_type(self):
+        with self.assertRaises(ValueError):
+            coalesced_include("key", "not a callable")
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class OtherProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return json.loads(s, **kwargs)
+
+
+class Money:
+    def __init__(self, amount, currency):
+        self.amount = amount
+        self.currency = currency
+
+
+class Row:
+    _mapping = {"id": 1}
+
+
+class TestSerializers(unittest.TestCase):
+    """Props serializers tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+
+        @self.inertia.serializer(Money)
+        def serialize_money(money):
+            return f"{money.amount} {money.currency}"
+
+        def objects():
+            return render_inertia(
+                "Objects",
+                props={
+                    "point": Point(1, 2),
+                    "color": Color.RED,
+                    "date": datetime.date(2024, 1, 2),
+                    "price": decimal.Decimal("1.50"),
+                    "id": uuid.UUID(int=1),
+                    "money": Money(3, "EUR"),
+                    "row": Row(),
+                    "named": collections.namedtuple("Named", "a")(1),
+                },
+            )
+
+        self.app.add_url_rule("/objects/", "objects", objects)
+        self.app.add_url_rule(
+            "/date/", "date", lambda: {"date": datetime.date(2024, 1, 2)}
+        )
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_page_objects_serialized(self):
+        for headers in ({}, {"X-Inertia": "true"}):
+            data = self.client.get("/objects/", headers=headers).inertia("app")
+            self.assertEqual(vars(data.props.point), {"x": 1, "y": 2})
+            self.assertEqual(data.props.color, "red")
+            self.assertEqual(data.props.date, "Tue, 02 Jan 2024 00:00:00 GMT")
+            self.assertEqual(data.props.price, "1.50")
+            self.assertEqual(data.props.id, str(uuid.UUID(int=1)))
+            self.assertEqual(data.props.money, "3 EUR")
+            self.assertEqual(vars(data.props.row), {"id": 1})
+            self.assertEqual(data.props.named, [1])
+
+    def test_iso_dates_serializer(self):
+        self.inertia.serializer(datetime.date)(lambda value: value.isoformat())
+        data = self.client.get("/objects/", headers={"X-Inertia": "true"})
+        self.assertEqual(data.inertia("app").props.date, "2024-01-02")
+
+    def test_app_json_not_affected(self):
+        response = self.client.get("/date/")
+        self.assertEqual(response.json["date"], "Tue, 02 Jan 2024 00:00:00 GMT")
+
+    def test_converters_cached(self):
+        registry = SerializerRegistry()
+        self.assertEqual(registry.default(Point(1, 2)), {"x": 1, "y": 2})
+        self.assertIn(Point, registry._converters)
+        with self.assertRaises(TypeError):
+            registry.default(object())
+
+    def test_custom_json_provider_extended(self):
+        class CustomProvider(DefaultJSONProvider):
+            @staticmethod
+            def default(obj):
+                if isinstance(obj, complex):
+                    return [obj.real, obj.imag]
+                return DefaultJSONProvider.default(obj)
+
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        app.json = CustomProvider(app)
+        app.json.sort_keys = False
+        inertia = Inertia(app)
+        inertia.serializer(Money)(lambda money: f"{money.amount} {money.currency}")
+        self.assertIsInstance(app.json, CustomProvider)
+        self.assertFalse(app.json.sort_keys)
+
+        app.add_url_rule(
+            "/",
+            "index",
+            lambda: render_inertia(
+                "Index", props={"money": Money(3, "EUR"), "value": 1j}
+            ),
+        )
+        response = app.test_client().get("/", headers={"X-Inertia": "true"})
+        self.assertEqual(response.json["props"], {"money": "3 EUR", "value": [0, 1]})
+
+    def test_other_json_provider_warned(self):
+        app = Flask(__name__)
+        app.json = OtherProvider(app)
+        with self.assertLogs(app.logger, "WARNING") as logs:
+            Inertia(app)
+        self.assertIs(type(app.json), OtherProvider)
+        self.assertIn("OtherProvider JSON provider", logs.output[0])
+
+
+class TestTableProps(unittest.TestCase):
+    """Columnar table props tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        Inertia(self.app)
+        rows = [{"id": 1, "name": "foo"}, {"id": 2, "name": "bar"}]
+
+        def report():
+            return render_inertia(
+                "Report",
+                props={
+                    "rows": table_include(rows),
+                    "ids": table_include(lambda: rows, columns=["id"]),
+                    "points": table_include([Point(1, 2)], columns=["y", "x"]),
+                    "columns": table_include({"id": range(2), "name": ("a", "b")}),
+                    "empty": table_include([], columns=["id"]),
+                    "lazy": lazy_include(lambda: table_include(rows)),
+                },
+            )
+
+        self.app.add_url_rule("/report/", "report", report)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_table_props(self):
+        response = self.client.get("/report/", headers={"X-Inertia": "true"})
+        props = response.json["props"]
+        self.assertEqual(
+            props["rows"],
+            {
+                "__inertia_table__": 1,
+                "columns": ["id", "name"],
+                "data": [[1, 2], ["foo", "bar"]],
+            },
+        )
+        self.assertEqual(props["ids"]["data"], [[1, 2]])
+        self.assertEqual(props["points"]["data"], [[2], [1]])
+        self.assertEqual(props["columns"]["data"], [[0, 1], ["a", "b"]])
+        self.assertEqual(props["empty"]["data"], [[]])
+
+    def test_lazy_table_prop(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Inertia-Partial-Component": "Report",
+            "X-Inertia-Partial-Data": "lazy",
+        }
+        response = self.client.get("/report/", headers=headers)
+        self.assertEqual(response.json["props"]["lazy"]["columns"], ["id", "name"])
+
+    def test_array_columns(self):
+        class Column(list):
+            def tolist(self):
+                return ["converted"]
+
+        prop = table_include({"value": Column([1])})
+        self.assertEqual(prop()["data"], [["converted"]])
+
+    def test_object_rows_require_columns(self):
+        with self.assertRaises(ValueError):
+            table_include([Point(1, 2)])()
+
+
+class TestNormalizedProps(unittest.TestCase):
+    """Props reference table normalization tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_NORMALIZE_REFS"] = True
+        self.inertia = Inertia(self.app)
+        self.inertia.reference(Point, key="x")
+        author = {"name": "foo"}
+
+        def posts():
+            return render_inertia(
+                "Posts",
+                props={
+                    "posts": [
+                        {"title": "a", "author": author, "point": Point(1, 2)},
+                        {"title": "b", "author": author, "point": Point(1, 3)},
+                    ],
+                    "me": author,
+                    "single": {"name": "bar"},
+                },
+            )
+
+        self.app.add_url_rule("/posts/", "posts", posts)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_normalized_props(self):
+        response = self.client.get("/posts/", headers={"X-Inertia": "true"})
+        page = response.json
+        self.assertEqual(page["refs"], {"0": {"name": "foo"}, "1": {"x": 1, "y": 2}})
+        self.assertEqual(page["props"]["me"], {"$ref": "0"})
+        self.assertEqual(
+            page["props"]["posts"][1],
+            {"title": "b", "author": {"$ref": "0"}, "point": {"$ref": "1"}},
+        )
+        self.assertEqual(page["props"]["single"], {"name": "bar"})
+
+    def test_normalized_html_page(self):
+        data = self.client.get("/posts/").inertia("app")
+        self.assertEqual(vars(data.props.me), {"$ref": "0"})
+        self.assertEqual(getattr(data.refs, "0").name, "foo")
+
+    def test_normalization_disabled(self):
+        self.app.config["INERTIA_NORMALIZE_REFS"] = False
+        response = self.client.get("/posts/", headers={"X-Inertia": "true"})
+        self.assertNotIn("refs", response.json)
+        self.assertEqual(response.json["props"]["me"], {"name": "foo"})
+
+    def test_circular_objects(self):
+        node = {"name": "root"}
+        node["self"] = node
+        props, refs = normalize_props({"node": node}, SerializerRegistry())
+        self.assertEqual(props, {"node": {"$ref": "0"}})
+        self.assertEqual(refs, {"0": {"name": "root", "self": {"$ref": "0"}}})
+
+
+class TestRawJSONProps(unittest.TestCase):
+    """Raw JSON props tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+        self.fragment = b'{"theme":"dark","tags":["a","<b>"]}'
+
+        def cms():
+            return render_inertia(
+                "Cms",
+                props={
+                    "config": raw_json_include(self.fragment),
+                    "content": raw_json_include(lambda: "[1, 2]"),
+                    "lazy": lazy_include(lambda: raw_json_include("null")),
+                },
+            )
+
+        self.app.add_url_rule("/cms/", "cms", cms)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_raw_json_spliced(self):
+        response = self.client.get("/cms/", headers={"X-Inertia": "true"})
+        self.assertIn(self.fragment, response.data)
+        self.assertEqual(response.json["props"]["content"], [1, 2])
+
+        data = self.client.get("/cms/").inertia("app")
+        self.assertEqual(data.props.config.tags, ["a", "<b>"])
+        self.assertEqual(data.props.content, [1, 2])
+
+    def test_lazy_raw_json(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Inertia-Partial-Component": "Cms",
+            "X-Inertia-Partial-Data": "lazy",
+        }
+        response = self.client.get("/cms/", headers=headers)
+        self.assertEqual(response.json["props"], {"lazy": None})
+
+    def test_fragments_validated_once(self):
+        with patch("flask_inertia.props.json") as mock_json:
+            self.client.get("/cms/", headers={"X-Inertia": "true"})
+            self.client.get("/cms/", headers={"X-Inertia": "true"})
+        self.assertEqual(mock_json.loads.call_count, 2)
+
+    def test_decoded_without_inertia_provider(self):
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        app.json = OtherProvider(app)
+        with self.assertLogs(app.logger, "WARNING"):
+            Inertia(app)
+
+        app.add_url_rule(
+            "/",
+            "index",
+            lambda: render_inertia(
+                "Index", props={"config": raw_json_include('{"theme": "dark"}')}
+            ),
+        )
+        response = app.test_client().get("/", headers={"X-Inertia": "true"})
+        self.assertEqual(response.json["props"], {"config": {"theme": "dark"}})
+        response = app.test_client().get("/")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_invalid_fragment(self):
+        self.fragment = b"{invalid"
+        with self.assertRaises(ValueError):
+            self.client.get("/cms/", headers={"X-Inertia": "true"})
+
+
+class TestMessagePack(unittest.TestCase):
+    """MessagePack responses tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+
+        def dashboard():
+            return render_inertia(
+                "Dashboard",
+                props={
+                    "values": [1, 2.5, 3],
+                    "date": datetime.date(2024, 1, 2),
+                    "config": raw_json_include('{"theme": "dark"}'),
+                },
+            )
+
+        self.app.add_url_rule("/dashboard/", "dashboard", dashboard)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+        self.headers = {"X-Inertia": "true", "Accept": "application/x-msgpack"}
+
+    def test_msgpack_response(self):
+        response = self.client.get("/dashboard/", headers=self.headers)
+        self.assertEqual(response.mimetype, "application/x-msgpack")
+        self.assertEqual(response.headers["Vary"], "Accept")
+        page = msgpack.unpackb(response.data)
+        self.assertEqual(page["component"], "Dashboard")
+        self.assertEqual(
+            page["props"],
+            {
+                "values": [1, 2.5, 3],
+                "date": "Tue, 02 Jan 2024 00:00:00 GMT",
+                "config": {"theme": "dark"},
+            },
+        )
+
+        data = response.inertia("app")
+        self.assertEqual(data.props.config.theme, "dark")
+
+    def test_json_by_default(self):
+        for accept in ("text/html, application/xhtml+xml", "application/json, */*"):
+            response = self.client.get(
+                "/dashboard/", headers={"X-Inertia": "true", "Accept": accept}
+            )
+            self.assertTrue(response.is_json)
+
+    def test_msgpack_not_installed(self):
+        with patch("flask_inertia.encoding._get_msgpack", return_value=None):
+            response = self.client.get("/dashboard/", headers=self.headers)
+        self.assertTrue(response.is_json)
+
+    def test_cached_responses_per_format(self):
+        self.inertia.add_shorthand_route("/faq/", "FAQ", cache=True)
+        self.app.view_functions["dashboard"] = self.inertia.cache_page(ttl=60)(
+            self.app.view_functions["dashboard"]
+        )
+        self.client.get("/dashboard/", headers=self.headers)
+        response = self.client.get("/dashboard/", headers={"X-Inertia": "true"})
+        self.assertTrue(response.is_json)
+
+        self.client.get("/faq/", headers=self.headers)
+        response = self.client.get("/faq/", headers={"X-Inertia": "true"})
+        self.assertTrue(response.is_json)
+        response = self.client.get("/faq/", headers=self.headers)
+        self.assertEqual(response.mimetype, "application/x-msgpack")
+
+
+class TestPropDeadlines(unittest.TestCase):
+    """Props deadlines tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        Inertia(self.app)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+        def slow():
+            self.release.wait(5)
+            return "slow"
+
+        def report():
+            return render_inertia(
+                "Report",
+                props={
+                    "fast": deadline_include(lambda: "fast", timeout=1),
+                    "stats": deadline_include(slow, timeout=0.05, fallback="n/a"),
+                    "chart": deadline_include(slow, timeout=0.05, group="charts"),
+                    "budget": deadline_include(slow, fallback=lambda: "later"),
+                },
+                timeout=0.1,
+            )
+
+        self.app.add_url_rule("/report/", "report", report)
+        self.app.response_class = InertiaTestResponse
+        self.client = self.app.test_client()
+
+    def test_missed_deadlines(self):
+        missed = []
+
+        def receiver(sender, **extra):
+            missed.append(extra)
+
+        with prop_deadline_missed.connected_to(receiver, self.app):
+            start = time.monotonic()
+            response = self.client.get("/report/", headers={"X-Inertia": "true"})
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 1)
+        page = response.json
+        self.assertEqual(
+            page["props"], {"fast": "fast", "stats": "n/a", "budget": "later"}
+        )
+        self.assertEqual(page["deferredProps"], {"charts": ["chart"]})
+        self.assertEqual(
+            sorted((m["key"], m["deferred"]) for m in missed),
+            [("budget", False), ("chart", True), ("stats", False)],
+        )
+        self.assertEqual(missed[0]["component"], "Report")
+
+    def test_deferred_prop_waited_when_requested(self):
+        headers = {
+            "X-Inertia": "true",
+            "X-Inertia-Partial-Component": "Report",
+            "X-Inertia-Partial-Data": "chart",
+        }
+        threading.Timer(0.2, self.release.set).start()
+        response = self.client.get("/report/", headers=headers)
+        self.assertEqual(response.json["props"], {"chart": "slow"})
+
+    def test_request_context_not_torn_down_by_workers(self):
+        teardowns = []
+        self.app.teardown_request(
+            lambda exc: teardowns.append(threading.current_thread().name)
+        )
+        self.app.add_url_rule(
+            "/path/",
+            "path",
+            lambda: render_inertia(
+                "Path", props={"path": deadline_include(lambda: request.path)}
+            ),
+        )
+        response = self.client.get("/path/", headers={"X-Inertia": "true"})
+        self.assertEqual(response.json["props"], {"path": "/path/"})
+        self.assertEqual(teardowns, [threading.current_thread().name])
+
+    def test_invalid_callback(self):
+        with self.assertRaises(ValueError):
+            deadline_include("value", timeout=1)
+
+
+class TestRevalidatedShares(unittest.TestCase):
+    """Stale-while-revalidate shared data tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = Inertia(self.app)
+        self.calls = 0
+
+        def count():
+            self.calls += 1
+            return self.calls
+
+        self.inertia.share("count", count, max_age=60)
+        self.app.add_url_rule(
+            "/", "index", lambda: render_inertia("Index", props={})
+        )
+        self.client = self.app.test_client()
+        self.headers = {"X-Inertia": "true"}
+
+    def get_count(self):
+        return self.client.get("/", headers=self.headers).json["props"]["count"]
+
+    @patch("flask_inertia.props.time")
+    def test_stale_value_refreshed_in_background(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        self.assertEqual(self.get_count(), 1)
+        self.assertEqual(self.get_count(), 1)
+        self.assertEqual(self.calls, 1)
+
+        mock_time.monotonic.return_value = 61
+        self.assertEqual(self.get_count(), 1)
+        for _ in range(500):
+            if (
+                self.calls == 2
+                and not self.inertia._shared_data["count"]._refreshing
+            ):
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.get_count(), 2)
+        self.assertEqual(self.calls, 2)
+
+    def test_value_must_be_callable(self):
+        with self.assertRaises(ValueError):
+            self.inertia.share("count", 1, max_age=60)
+
+    def test_not_shared_per_request(self):
+        with self.app.test_request_context():
+            with self.assertRaises(RuntimeError):
+                self.inertia.share("count", lambda: 1, max_age=60)
+
+
+class InertiaProtocolTests:
+    """Inertia protocol tests shared by the Flask and Quart adapters.
+
+    Subclasses create ``self.app`` with ``add_page`` registering a view rendering
+    a component and implement ``request`` returning the status, headers and body
+    of a response.
+    """
+
+    def add_page(self, url, component_name, props):
+        raise NotImplementedError
+
+    def request(self, method, url, headers=None):
+        raise NotImplementedError
+
+    def add_pages(self):
+        self.add_page(
+            "/users/",
+            "Users",
+            lambda: {
+                "users": ["foo", "bar"],
+                "count": depends_include(lambda users: len(users), "users"),
+                "stats": lazy_include(lambda: "stats"),
+                "flash": always_include("flash"),
+                "chart": defer_include(lambda: "chart", group="charts"),
+                "slow": deadline_include(
+                    lambda: time.sleep(0.2) or "slow", timeout=0.02, fallback="n/a"
+                ),
+            },
+        )
+
+    def get_page(self, url, headers=None):
+        headers = {"X-Inertia": "true", **(headers or {})}
+        status, response_headers, body = self.request("GET", url, headers)
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertTrue(response_headers.get("X-Inertia"))
+        self.assertEqual(response_headers.get("Vary"), "Accept")
+        return json.loads(body)
+
+    def test_html_page(self):
+        status, _, body = self.request("GET", "/users/")
+        self.assertEqual(status, HTTPStatus.OK)
+        page = re.search(r"data-page='([^']*)'", body.decode()).group(1)
+        self.assertEqual(json.loads(page)["component"], "Users")
+
+    def test_json_page(self):
+        page = self.get_page("/users/")
+        self.assertEqual(page["component"], "Users")
+        self.assertEqual(
+            page["props"],
+            {
+                "users": ["foo", "bar"],
+                "count": 2,
+                "flash": "flash",
+                "slow": "n/a",
+                "shared": "shared",
+            },
+        )
+        self.assertEqual(page["deferredProps"], {"charts": ["chart"]})
+
+    def test_partial_reload(self):
+        page = self.get_page(
+            "/users/",
+            {
+                "X-Inertia-Partial-Component": "Users",
+                "X-Inertia-Partial-Data": "stats,chart",
+            },
+        )
+        self.assertEqual(
+            page["props"],
+            {
+                "stats": "stats",
+                "chart": "chart",
+                "flash": "flash",
+                "shared": "shared",
+            },
+        )
+        self.assertNotIn("deferredProps", page)
+
+    def test_version_conflict(self):
+        headers = {
+            "X-Requested-With": "XMLHttpRequest",
+            "X-Inertia": "true",
+            "X-Inertia-Version": "outdated",
+        }
+        status, response_headers, _ = self.request("GET", "/users/", headers)
+        self.assertEqual(status, HTTPStatus.CONFLICT)
+        self.assertEqual(response_headers.get("X-Inertia-Location"), "/users/?")
+
+    def test_xhr_without_inertia_header(self):
+        headers = {"X-Requested-With": "XMLHttpRequest"}
+        status, _, _ = self.request("GET", "/users/", headers)
+        self.assertEqual(status, HTTPStatus.BAD_REQUEST)
+
+    def test_redirect_after_update(self):
+        status, _, _ = self.request("PUT", "/redirect/")
+        self.assertEqual(status, HTTPStatus.SEE_OTHER)
+
+
+class TestFlaskProtocol(InertiaProtocolTests, unittest.TestCase):
+    """Inertia protocol tests with Flask."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        inertia = Inertia(self.app)
+        inertia.share("shared", "shared")
+        self.add_pages()
+        self.app.add_url_rule(
+            "/redirect/",
+            "redirect",
+            lambda: redirect("/users/"),
+            methods=["PUT"],
+        )
+        self.client = self.app.test_client()
+
+    def add_page(self, url, component_name, props):
+        self.app.add_url_rule(
+            url, component_name, lambda: render_inertia(component_name, props())
+        )
+
+    def request(self, method, url, headers=None):
+        response = self.client.open(url, method=method, headers=headers)
+        return response.status_code, response.headers, response.data
+
+
+@unittest.skipIf(quart is None, "Quart is not installed")
+class TestQuartProtocol(InertiaProtocolTests, unittest.TestCase):
+    """Inertia protocol tests with Quart."""
+
+    def setUp(self):
+        from flask_inertia.quart import QuartInertia
+
+        self.app = quart.Quart(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.inertia = QuartInertia(self.app)
+        self.inertia.share("shared", "shared")
+        self.add_pages()
+
+        async def redirect_view():
+            return quart.redirect("/users/")
+
+        self.app.add_url_rule(
+            "/redirect/", "redirect", redirect_view, methods=["PUT"]
+        )
+        self.client = self.app.test_client()
+
+    def add_page(self, url, component_name, props):
+        from flask_inertia.quart import render_inertia
+
+        async def view():
+            return await render_inertia(component_name, props())
+
+        self.app.add_url_rule(url, component_name, view)
+
+    def request(self, method, url, headers=None):
+        async def send():
+            response = await self.client.open(url, method=method, headers=headers)
+            return response.status_code, response.headers, await response.get_data()
+
+        return asyncio.run(send())
+
+    def test_coroutine_props(self):
+        from flask_inertia.quart import render_inertia
+
+        @self.inertia.resource("orders")
+        async def orders():
+            await asyncio.sleep(0)
+            return [1, 2, 3]
+
+        async def total(orders):
+            return sum(orders)
+
+        async def view():
+            return await render_inertia(
+                "Orders",
+                props={
+                    "total": depends_include(total, "orders"),
+                    "late": deadline_include(
+                        lambda: asyncio.sleep(0.2), timeout=0.02, group="late"
+                    ),
+                },
+            )
+
+        self.app.add_url_rule("/orders/", "orders", view)
+        page = self.get_page("/orders/")
+        self.assertEqual(page["props"], {"total": 6, "shared": "shared"})
+        self.assertEqual(page["deferredProps"], {"late": ["late"]})
+
+    @patch("flask_inertia.props.time")
+    def test_revalidated_share(self, mock_time):
+        contexts = []
+
+        def visits():
+            contexts.append(quart.has_app_context())
+            return len(contexts)
+
+        self.inertia.share("visits", visits, max_age=60)
+        mock_time.monotonic.return_value = 0
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 1)
+
+        mock_time.monotonic.return_value = 61
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 1)
+        for _ in range(500):
+            if not self.inertia._shared_data["visits"]._refreshing:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 2)
+        self.assertEqual(contexts, [True, True])
+
+    @patch("flask_inertia.props.time")
+    def test_revalidated_coroutine_share(self, mock_time):
+        visits = []
+
+        async def count_visits():
+            await asyncio.sleep(0)
+            visits.append(quart.has_app_context())
+            return len(visits)
+
+        self.inertia.share("visits", count_visits, max_age=60)
+        mock_time.monotonic.return_value = 0
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 1)
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 1)
+
+        mock_time.monotonic.return_value = 61
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 1)
+        for _ in range(500):
+            if not self.inertia._shared_data["visits"]._refreshing:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.get_page("/users/")["props"]["visits"], 2)
+        self.assertEqual(visits, [True, True])
+
+
+class TestRenderProfiling(unittest.TestCase):
+    """Sampled renders profiling tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_PROFILE_SAMPLE_RATE"] = 1
+        self.app.config["INERTIA_PROFILE_THRESHOLD"] = 0
+        self.app.config["INERTIA_PROFILE_MEMORY"] = True
+        self.inertia = Inertia(self.app)
+        self.profiles = []
+        self.inertia.profile_sink = self.profiles.append
+        self.app.add_url_rule(
+            "/",
+            "index",
+            lambda: render_inertia(
+                "Users/Index",
+                props={"users": lambda: [str(i) for i in range(1000)], "count": 1},
+            ),
+        )
+        self.client = self.app.test_client()
+
+    def test_slow_render_profiled(self):
+        self.client.get("/", headers={"X-Inertia": "true"})
+        (profile,) = self.profiles
+        self.assertEqual(profile.component, "Users/Index")
+        self.assertEqual(set(profile.props), {"users", "count"})
+        self.assertGreater(profile.props["users"].allocated, 0)
+        self.assertIsNotNone(profile.snapshot)
+        self.assertGreater(profile.stats.total_calls, 0)
+
+    def test_fast_render_not_reported(self):
+        self.app.config["INERTIA_PROFILE_THRESHOLD"] = 60
+        self.client.get("/", headers={"X-Inertia": "true"})
+        self.assertEqual(self.profiles, [])
+
+    def test_sampling(self):
+        self.app.config["INERTIA_PROFILE_SAMPLE_RATE"] = 10
+        with patch("flask_inertia.profiling.random.randrange", return_value=3):
+            self.client.get("/", headers={"X-Inertia": "true"})
+        self.assertEqual(self.profiles, [])
+
+    def test_directory_sink(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.inertia.profile_sink = DirectorySink(directory, keep=2)
+        for _ in range(3):
+            self.client.get("/", headers={"X-Inertia": "true"})
+
+        files = sorted(os.listdir(directory))
+        self.assertEqual(len(files), 6)
+        with open(os.path.join(directory, files[0])) as summary:
+            self.assertEqual(json.load(summary)["component"], "Users/Index")
+
+    def test_log_sink(self):
+        self.inertia.profile_sink = LogSink()
+        with self.assertLogs(self.app.logger, "WARNING") as logs:
+            self.client.get("/", headers={"X-Inertia": "true"})
+        self.assertIn("Slow Inertia render of Users/Index", logs.output[0])
+
+    def test_enabled_after_init_app(self):
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        inertia = Inertia(app)
+        self.assertIsNone(inertia.profile_sink)
+
+        app.config["INERTIA_PROFILE_SAMPLE_RATE"] = 1
+        app.config["INERTIA_PROFILE_THRESHOLD"] = 0
+        app.add_url_rule("/", "index", lambda: render_inertia("Index"))
+        with self.assertLogs(app.logger, "WARNING") as logs:
+            app.test_client().get("/", headers={"X-Inertia": "true"})
+        self.assertIsInstance(inertia.profile_sink, LogSink)
+        self.assertIn("Slow Inertia render of Index", logs.output[0])
+
+
+class TestPayloadBudgets(unittest.TestCase):
+    """Payload budgets tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_PAYLOAD_BUDGET"] = 500
+        self.app.config["INERTIA_PAYLOAD_BUDGETS"] = {"Small": 10}
+        Inertia(self.app)
+        props = {
+            "users": ["user"] * 100,
+            "count": 100,
+            "config": raw_json_include('{"theme": "dark"}'),
+        }
+        self.app.add_url_rule("/", "index", lambda: render_inertia("Index", props))
+        self.app.add_url_rule("/small/", "small", lambda: render_inertia("Small"))
+        self.client = self.app.test_client()
+        self.headers = {"X-Inertia": "true"}
+
+    def test_page_within_budget(self):
+        self.app.config["INERTIA_PAYLOAD_BUDGET"] = 10000
+        with patch.object(self.app.logger, "warning") as warning:
+            response = self.client.get("/", headers=self.headers)
+        self.assertFalse(warning.called)
+        self.assertEqual(response.json["props"]["users"], ["user"] * 100)
+        self.assertEqual(response.json["props"]["config"], {"theme": "dark"})
+
+    def test_budget_exceeded_logged(self):
+        with self.assertLogs(self.app.logger, "WARNING") as logs:
+            response = self.client.get("/", headers=self.headers)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn("Index page is", logs.output[0])
+        self.assertIn("over its 500 bytes budget (users=", logs.output[0])
+
+    def test_budget_exceeded_raises(self):
+        self.app.config["INERTIA_PAYLOAD_BUDGET_ACTION"] = "raise"
+        with self.assertRaises(PayloadBudgetExceeded) as context:
+            self.client.get("/", headers=self.headers)
+        report = context.exception.report
+        self.assertEqual(report.component, "Index")
+        self.assertEqual(set(report.props), {"users", "count", "config"})
+        self.assertGreater(report.props["users"], report.props["count"])
+
+    def test_budget_exceeded_header(self):
+        self.app.config["INERTIA_PAYLOAD_BUDGET_ACTION"] = "header"
+        for headers in (self.headers, {}):
+            response = self.client.get("/", headers=headers)
+            self.assertIn("users=", response.headers["X-Inertia-Payload-Budget"])
+
+    def test_component_budget(self):
+        self.app.config["INERTIA_PAYLOAD_BUDGET_ACTION"] = "raise"
+        with self.assertRaises(PayloadBudgetExceeded):
+            self.client.get("/small/", headers=self.headers)
+
+
+class TestVersionGate(unittest.TestCase):
+    """Version gate middleware tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_VERSION_GATE"] = True
+        self.app.add_url_rule("/", "index", index, methods=["GET", "POST"])
+        Inertia(self.app)
+        self.dispatched = []
+        self.app.before_request(lambda: self.dispatched.append(request.path))
+        self.client = self.app.test_client()
+        self.headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "X-Inertia-Version": "outdated",
+        }
+
+    def test_outdated_client(self):
+        response = self.client.get("/?page=2", headers=self.headers)
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        self.assertEqual(response.headers["X-Inertia-Location"], "/?page=2")
+        self.assertEqual(self.dispatched, [])
+
+    def test_passed_through(self):
+        self.client.post("/", headers=self.headers)
+        self.client.get("/", headers={"X-Inertia-Version": "outdated"})
+        with self.app.app_context():
+            self.headers["X-Inertia-Version"] = get_asset_version()
+        response = self.client.get("/", headers=self.headers)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.dispatched, ["/", "/", "/"])
+
+    def test_version_computed_once(self):
+        with patch("flask_inertia.core.hash_template") as compute:
+            compute.return_value = "1234"
+            for _ in range(3):
+                self.client.get("/", headers=self.headers)
+        self.assertEqual(compute.call_count, 1)
+
+    def test_disabled(self):
+        app = Flask(__name__, template_folder=".")
+        app.config.from_object(TestConfig)
+        Inertia(app)
+        self.assertNotIsInstance(app.wsgi_app, VersionGate)
+
+
+class TestBatchReload(unittest.TestCase):
+    """Batch reload endpoint tests."""
+
+    def setUp(self):
+        self.app = Flask(__name__, template_folder=".")
+        self.app.config.from_object(TestConfig)
+        self.app.config["INERTIA_BATCH_URL"] = "/_inertia/batch"
+        self.queries = []
+
+        def orders_view():
+            return render_inertia(
+                "Orders",
+                props={
+                    "orders": depends_include(lambda orders: orders, "orders"),
+                    "count": depends_include(lambda orders: len(orders), "orders"),
+                    "user": session.get("user"),
+                },
+            )
+
+        self.app.secret_key = "secret"
+        self.app.add_url_rule("/orders/", "orders", orders_view)
+        self.app.add_url_rule("/partial/", "partial", partial_loading)
+        self.app.add_url_rule("/redirect/", "redirect", lambda: redirect("/orders/"))
+        self.inertia = Inertia(self.app)
+
+        @self.inertia.resource("orders")
+        def orders():
+            self.queries.append(request.args.get("page"))
+            return [1, 2, 3]
+
+        self.client = self.app.test_client()
+        with self.client.session_transaction() as client_session:
+            client_session["user"] = "foo"
+        self.headers = {"X-Inertia": "true", "X-Requested-With": "XMLHttpRequest"}
+
+    def test_batch_reload(self):
+        response = self.client.post(
+            "/_inertia/batch",
+            json=[
+                {
+                    "url": "/orders/?page=2",
+                    "component": "Orders",
+                    "only": ["orders"],
+                },
+                {
+                    "url": "/orders/",
+                    "component": "Orders",
+                    "only": ["count", "user"],
+                },
+                {"url": "/partial/", "component": "Partial", "only": ["a"]},
+                {"url": "/redirect/", "component": "Orders", "only": ["count"]},
+            ],
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        orders, count, partial, redirected = response.json
+        self.assertEqual(orders["status"], 200)
+        self.assertEqual(orders["page"]["props"], {"orders": [1, 2, 3]})
+        self.assertEqual(orders["page"]["url"], "http://localhost/orders/?page=2")
+        self.assertEqual(count["page"]["props"], {"count": 3, "user": "foo"})
+        self.assertEqual(partial["page"]["props"], {"a": "a", "d": "d"})
+        self.assertEqual(redirected, {"status": 302, "location": "/orders/"})
+        self.assertEqual(self.queries, ["2", None])
+
+    def test_resources_per_reload(self):
+        self.app.add_url_rule(
+            "/projects/<int:pid>/",
+            "project",
+            lambda pid: render_inertia(
+                "Project",
+                props={
+                    "project": depends_include(lambda project: project, "project")
+                },
+            ),
+        )
+
+        @self.inertia.resource("project")
+        def project():
+            return f"project {request.view_args['pid']}"
+
+        response = self.client.post(
+            "/_inertia/batch",
+            json=[
+                {"url": "/projects/1/", "component": "Project", "only": ["project"]},
+                {"url": "/projects/2/", "component": "Project", "only": ["project"]},
+            ],
+            headers=self.headers,
+        )
+        first, second = response.json
+        self.assertEqual(first["page"]["props"], {"project": "project 1"})
+        self.assertEqual(second["page"]["props"], {"project": "project 2"})
+
+    def test_outdated_version(self):
+        self.headers["X-Inertia-Version"] = "outdated"
+        response = self.client.post(
+            "/_inertia/batch",
+            json=[
+                {"url": "/orders/?page=2", "component": "Orders", "only": ["count"]}
+            ],
+            headers=self.headers,
+        )
+        self.assertEqual(
+            response.json, [{"status": 409, "location": "/orders/?page=2"}]
+        )
+
+    @parameterized.expand(
+        [
+            ({"url": "/orders/"},),
+            ([{"url": "/orders/", "component": "Orders"}],),
+            ([{"url": "/orders/", "component": "Orders", "only": []}],),
+            ([{"url": "/orders/", "component": "Orders", "only": ["count"]}] * 11,),
+        ]
+    )
+    def test_invalid_batch(self, descriptors):
+        response = self.client.post("/_inertia/batch", json=descriptors)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(self.queries, [])
+
+
+class TestTTLCache(unittest.TestCase):
+    """In-memory cache tests."""
+
+    def test_size_bounded(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.pop("c"), 3)
+        self.assertIsNone(cache.get("c"))
+
+
 class TestInertiaTestUtils(unittest.TestCase):
     """Flask-Inertia tests."""
 
@@ -357,6 +2294,7 @@ class TestInertiaTestUtils(unittest.TestCase):
         self.inertia.add_shorthand_route("/faq/", "FAQ")
 
         self.app.response_class = InertiaTestResponse
+        self.app.test_client_class = InertiaTestClient
         self.client = self.app.test_client()
 
     def test_partial_loading(self):
@@ -401,33 +2339,31 @@ class TestInertiaTestUtils(unittest.TestCase):
         data = response.inertia("app")
         self.assertEqual(data.props.fizz, "buzz")
 
-    def test_import_error(self):
-        import builtins
-
-        realimport = builtins.__import__
-
-        # replace builtins import with a mockup raising an ImportError
-        # when import BeautifulSoup
-        def mockupimport(name, *args, **kwargs):
-            if name == "bs4":
-                raise ImportError("Test")
-            return realimport(name, *args, **kwargs)
+    def test_recorded_page(self):
+        self.inertia.share("foo", "bar")
+        with patch("flask_inertia.unittest.extract_page") as extract:
+            data = self.client.get("/").inertia("app")
+        self.assertFalse(extract.called)
+        self.assertEqual(data.component, "Index")
+        self.assertEqual(data.props.foo, "bar")
 
-        builtins.__import__ = mockupimport
-        response = self.client.get("/")
-        with self.assertRaises(ImportError) as exc:
-            response.inertia("app")
+    def test_html_page(self):
+        self.app.test_client_class = None
+        self.inertia.share("foo", "<b>&bar</b>")
+        response = self.app.test_client().get("/")
+        self.assertNotIn("flask_inertia.pages", response.request.environ)
+        data = response.inertia("app")
+        self.assertEqual(data.component, "Index")
+        self.assertEqual(data.props.foo, "<b>&bar</b>")
 
-        self.assertIn(
-            "flask-inertia needs BeautifulSoup to parse html messages",
-            exc.exception.msg,
-        )
-        self.assertIn(
-            "please install it using `pip install flask-inertia[tests]`",
-            exc.exception.msg,
-        )
+        with self.assertRaises(ValueError):
+            response.inertia("root")
 
-        builtins.__import__ = realimport
+    def test_extract_page(self):
+        html = '<html><body><div id="app" data-page="{&quot;a&quot;: 1}"></div>'
+        self.assertEqual(extract_page(html, "app"), '{"a": 1}')
+        self.assertEqual(extract_page('<div id="app"></div>', "app"), "{}")
+        self.assertIsNone(extract_page(html, "root"))
 
     def view_data_not_in_js_context(self):
         response = self.client.get("/meta/")